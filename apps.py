@@ -1,5 +1,8 @@
 import streamlit as st
 
+from utils.navegacao import configurar_locale, estilos, medir, paginas
+from utils.perfil import execucao, painel
+
 if "toggle_sidebar" not in st.session_state:
     st.session_state["toggle_sidebar"] = "expanded"
 
@@ -10,32 +13,14 @@ st.set_page_config(
     initial_sidebar_state=st.session_state["toggle_sidebar"],
 )
 
+configurar_locale()
 
-def toggle_sidebar() -> None:
-    if st.session_state["toggle_sidebar"] == "expanded":
-        st.session_state["toggle_sidebar"] = "collapsed"
-    else:
-        st.session_state["toggle_sidebar"] = "expanded"
-
-
-with open("styles/styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-
-with st.sidebar:
-    st.header(":material/home: Menu")
-
-    st.markdown("")
-
-    if st.button("**Contracheque**", key="btn1", type="tertiary", icon=":material/payments:",
-                 use_container_width=True, on_click=toggle_sidebar):
-        st.switch_page("pages/contracheque.py")
+st.markdown(f"<style>{estilos()}</style>", unsafe_allow_html=True)
 
-    if st.button("**Mega-Sena**", key="btn2", type="tertiary", icon=":material/nest_thermostat_e_eu:",
-                 use_container_width=True, on_click=toggle_sidebar):
-        st.switch_page("pages/megasena.py")
+# as páginas só são importadas e executadas quando abertas; este arquivo roda antes de cada uma
+pagina = st.navigation(list(paginas().values()), position="hidden")
 
-    if st.button("**Cursos da UniBB**", key="btn3", type="tertiary", icon=":material/auto_stories:",
-                 use_container_width=True, on_click=toggle_sidebar):
-        st.switch_page("pages/unibb.py")
+with medir(pagina.title), execucao(pagina.title):
+    pagina.run()
 
-st.title(":material/logo_dev: Meus Apps")
+painel()
@@ -1,20 +1,27 @@
 import calendar
-import locale
+import os
 import random
-from datetime import datetime
+from datetime import date, datetime
+from itertools import islice
 from string import ascii_letters, digits, punctuation
 
 import pandas as pd
-import requests
 import streamlit as st
 from unidecode import unidecode
 
+from utils.cotacao import PARES, Cotacoes, FonteAwesome, FonteLocal, Historico
+from utils.navegacao import configurar_locale
+from utils.numeros import (LIMITE_DIGITOS, LIMITE_DIGITOS_PRIMO, eh_primo, fatorar, fatorial, fibonacci,
+                           log10_fatorial, log10_fibonacci, notacao_cientifica, quantidade_divisores, serie_fibonacci)
+from utils.sites import Verificador, percentis
+from utils.textos import arabico, de_morse, extenso, extenso_reais, para_morse, romano
+
 st.set_page_config(
     page_title="Streamlit Apps",
     layout="wide",
 )
 
-locale.setlocale(category=locale.LC_ALL, locale="pt_BR.UTF-8")
+configurar_locale()
 
 # with open("styles/styles.css") as f:
 #     st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
@@ -23,34 +30,59 @@ st.markdown("#### :material/logo_dev: Meus Apps")
 
 col1, col2, col3 = st.columns(3, border=True)
 
-with col1.expander("Cotação de Moedas Estrangeiras", icon="💰"):
+expander_cotacao = col1.expander("Cotação de Moedas Estrangeiras", icon="💰", key="expander_cotacao",
+                                 on_change="rerun")
+
+with expander_cotacao:
     def format_date_br(date_default: str) -> str:
         return f"{datetime.strptime(date_default, format('%Y-%m-%d %H:%M:%S')):%d/%m/%Y %H:%M:%S}"
 
 
-    with st.spinner("**Carregando, aguarde...**", show_time=True):
-        get_cota_us = pd.DataFrame([requests.get("https://economia.awesomeapi.com.br/last/USD-BRL").json()["USDBRL"]])
-        get_cota_us = get_cota_us[["name", "create_date", "bid"]]
+    @st.cache_resource(show_spinner=False)
+    def load_fonte() -> FonteAwesome | FonteLocal:
+        return FonteLocal() if os.environ.get("COTACAO_LOCAL") else FonteAwesome()
+
+
+    @st.cache_resource(show_spinner=False)
+    def load_cotacoes() -> Cotacoes:
+        return Cotacoes(load_fonte())
+
+
+    @st.cache_resource(show_spinner=False)
+    def load_historico() -> Historico:
+        return Historico(load_fonte())
+
+
+    # cotações e histórico dependem da rede: só rodam com o expander aberto
+    if expander_cotacao.open:
+        with st.spinner("**Carregando, aguarde...**", show_time=True):
+            cota = load_cotacoes().obter()
+
+            if cota.empty:
+                st.warning("Cotações indisponíveis no momento.")
+
+            st.dataframe(
+                data=cota,
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "name": st.column_config.TextColumn("Moeda $"),
+                    "create_date": st.column_config.DatetimeColumn("Data/Hora", format="DD/MM/YYYY HH:MM:SS"),
+                    "bid": st.column_config.NumberColumn("Valor R$", format="dollar"),
+                },
+            )
 
-        get_cota_eu = pd.DataFrame([requests.get("https://economia.awesomeapi.com.br/last/EUR-BRL").json()["EURBRL"]])
-        get_cota_eu = get_cota_eu[["name", "create_date", "bid"]]
+        st.selectbox("Histórico da moeda:", options=PARES, key="par_historico")
 
-        get_cota_gb = pd.DataFrame([requests.get("https://economia.awesomeapi.com.br/last/GBP-BRL").json()["GBPBRL"]])
-        get_cota_gb = get_cota_gb[["name", "create_date", "bid"]]
+        # a sincronização roda numa thread; o gráfico mostra o que já está gravado e cresce nos próximos reruns
+        if load_historico().atualizar(st.session_state["par_historico"], date(date.today().year - 5, 1, 1)):
+            st.caption("Atualizando o histórico em segundo plano...")
 
-        cota = pd.concat([get_cota_us, get_cota_eu, get_cota_gb])
-        cota["name"] = cota["name"].apply(lambda x: x.replace("/Real Brasileiro", ""))
+        elif st.session_state["par_historico"] in load_historico().erros:
+            st.warning("Não foi possível atualizar o histórico; exibindo o que já está gravado.")
 
-        st.dataframe(
-            data=cota,
-            hide_index=True,
-            use_container_width=True,
-            column_config={
-                "name": st.column_config.TextColumn("Moeda $"),
-                "create_date": st.column_config.DatetimeColumn("Data/Hora", format="DD/MM/YYYY HH:MM:SS"),
-                "bid": st.column_config.NumberColumn("Valor R$", format="dollar"),
-            },
-        )
+        st.line_chart(load_historico().serie(st.session_state["par_historico"]), x="data", y="bid", x_label="",
+                      y_label="Valor R$", height=250)
 
 with col2.expander("Markdown Incrível", icon="💯"):
     st.markdown("*Streamlit* é **realmente** ***legal***.")
@@ -62,88 +94,50 @@ with col2.expander("Markdown Incrível", icon="💯"):
                 " :tulip::cherry_blossom::rose::hibiscus::sunflower::blossom:")
 
 with col3.expander("Valor por extenso", icon="💯"):
-    def num_extenso(n: int) -> str:
-        unidade = ["zero", "um", "dois", "três", "quatro", "cinco", "seis", "sete", "oito", "nove"]
-        dez_x = ["dez", "onze", "doze", "treze", "quatorze", "quinze", "dezesseis", "dezessete", "dezoito", "dezenove"]
-        dezena = ["", "", "vinte", "trinta", "quarenta", "cinquenta", "sessenta", "setenta", "oitenta", "noventa",
-                  "cem"]
-
-        return dezena[n // 10] + " e " + unidade[n % 10] \
-            if n >= 20 and n % 10 != 0 else dezena[n // 10] \
-            if n >= 20 and n % 10 == 0 else dez_x[n % 10] \
-            if 10 <= n < 20 and n % 10 == 0 else dez_x[n - 10] \
-            if 10 <= n < 20 and n % 10 != 0 else unidade[n] \
-            if n < 10 and n % 10 != 0 else unidade[0]
-
-
-    st.number_input("Digite um número entre 0 e 100:", value=0, key="extenso", min_value=0, max_value=100)
+    st.number_input("Digite um valor:", value=0.0, key="extenso", min_value=0.0, max_value=999_999_999_999.99,
+                    format="%.2f")
+    st.toggle("Em reais", value=True, key="extenso_reais")
 
     msg_extenso = st.empty()
 
 col1, col2, col3 = st.columns(3, border=True)
 
 with col1.expander("Código do Morse", icon="💰"):
-    def code_morse(txt_morse: str) -> str:
-        code: dict[str, str] = {
-            "A": ".-", "B": "-...", "C": "-.-.", "D": "-..", "E": ".", "F": "..-.", "G": "--.",
-            "H": "....", "I": "..", "J": ".---", "K": "-.-", "L": ".-..", "M": "--", "N": "-.",
-            "O": "---", "P": ".--.", "Q": "--.-", "R": ".-.", "S": "...", "T": "-", "U": "..-",
-            "V": "...-", "W": ".--", "X": "-..-", "Y": "-.--", "Z": "--..", "1": ".----",
-            "2": "..---", "3": "...--", "4": "....-", "5": ".....", "6": "-....", "7": "--...",
-            "8": "---..", "9": "----.", "0": "-----", ",": "--..--", ".": ".-.-.-", "?": "..--..",
-            "/": "-..-.", "-": "-....-", "(": "-.--.", ")": "-.--.-", "!": "-.-.--", " ": " ",
-            "'": ".----.", ":": "---..."
-        }
-
-        return " ".join(code[morse] for morse in unidecode(txt_morse).upper())
-
-
+    # texto só com pontos, traços, barras e espaços é lido como Morse e convertido de volta
     st.text_input("Digite o texto a ser convertido para Código Morse:", key="txt_morse")
 
     msg_morse = st.empty()
 
 with col2.expander("Checador de IP", icon="💯"):
-    # faz uma requisição GET ao site Google
+    @st.cache_resource(show_spinner=False)
+    def load_verificador() -> Verificador:
+        return Verificador()
+
+
+    # HEAD em todos os sites ao mesmo tempo; vários sites separados por vírgula ou espaço
     st.text_input("Digite o site para verificar o status:", key="site", icon=":material/public:")
 
     msg_site = st.empty()
 
 with col3.expander("Algoritmo Romano", icon="💯"):
-    def alg_romano(num_rom):
-        val_int = [1000, 900, 500, 400, 100, 90, 50, 40, 10, 9, 5, 4, 1]
-        val_rom = ["M", "CM", "D", "CD", "C", "XC", "L", "XL", "X", "IX", "V", "IV", "I"]
-        num_romano = ""
-        b = 0
-        while num_rom > 0:
-            for _ in range(num_rom // val_int[b]):
-                num_romano += val_rom[b]
-                num_rom -= val_int[b]
-            b += 1
-        return num_romano
-
-
-    st.number_input("Digite um número a ser convertido:", key="romano", min_value=0, max_value=9999)
+    st.text_input("Digite um número ou um romano a ser convertido:", key="romano")
 
     msg_romano = st.empty()
 
 col1, col2, col3 = st.columns(3, border=True)
 
 with col1.expander("Série de Fibonacci", icon="💰"):
-    def fibonacci(n: int) -> list[int]:
-        sequencia: list[int] = [0, 1]
-
-        while len(sequencia) < n:
-            sequencia.append(sequencia[-1] + sequencia[-2])
-
-        return sequencia
-
-
     st.number_input("Digite um número para gerar série de Fibonacci:", min_value=0, key="fibonacci")
 
     msg_fibonacci = st.empty()
 
 with col2.expander("Número Primo", icon="💰"):
-    st.number_input("Digite um número para verificar se é primo:", key="prime", min_value=0)
+    def fatoracao(fatores: dict[int, int]) -> str:
+        return " × ".join(f"{primo}<sup>{expoente}</sup>" if expoente > 1 else f"{primo}"
+                          for primo, expoente in fatores.items())
+
+
+    st.text_input("Digite um número para verificar se é primo:", key="prime")
 
     msg_primo = st.empty()
 
@@ -159,10 +153,6 @@ with col3.expander("Palíndromo", icon="💯"):
 col1, col2, col3 = st.columns(3, border=True)
 
 with col1.expander("Fatorial", icon="💰"):
-    def fatorial(x1):
-        return 1 if x1 == 1 else x1 * fatorial(x1 - 1)
-
-
     st.number_input("Digite um número para fatorial:", key="fatorial", min_value=0)
 
     msg_fatorial = st.empty()
@@ -178,36 +168,92 @@ with col3.expander("Gerador de Senha", icon="💰"):
     msg_pass = st.empty()
 
 if st.session_state["extenso"]:
-    msg_extenso.markdown(f"O número por extenso é {num_extenso(st.session_state['extenso'])}.")
+    msg_extenso.markdown(f"O valor por extenso é {extenso_reais(st.session_state['extenso'])}."
+                         if st.session_state["extenso_reais"] else
+                         f"O número por extenso é {extenso(int(st.session_state['extenso']))}.")
 
 if st.session_state["txt_morse"]:
-    msg_morse.markdown(code_morse(st.session_state['txt_morse']))
+    msg_morse.markdown(de_morse(st.session_state["txt_morse"]) if set(st.session_state["txt_morse"]) <= set(".-/ ")
+                       else para_morse(st.session_state["txt_morse"]))
 
 if st.session_state["site"]:
-    try:
-        status: int = requests.get(f"https://{st.session_state['site']}").status_code
-        msg_site.markdown(f"O status do site do IP é {status}.")
-
-    except requests.exceptions.ConnectionError:
-        st.markdown("O site não está acessível.")
+    status_sites: pd.DataFrame = pd.DataFrame(load_verificador().verificar(st.session_state["site"].replace(",", " ")
+                                                                                                  .split()))
+
+    if len(status_sites) == 1:
+        msg_site.markdown(f"O status do site do IP é {status_sites['status'].iat[0]:.0f} "
+                          f"({status_sites['total'].iat[0]:.0f} ms)"
+                          + (f", redirecionado para {status_sites['destino'].iat[0]}."
+                             if status_sites["destino"].notna().iat[0] else ".")
+                          if status_sites["erro"].isna().iat[0]
+                          else f"O site não está acessível ({status_sites['erro'].iat[0]}).")
+
+    else:
+        with msg_site.container():
+            st.markdown(" · ".join(f"**{quantil}:** {valor:.0f} ms"
+                                   for quantil, valor in percentis(status_sites.to_dict("records")).items()))
+
+            st.dataframe(
+                data=status_sites[["site", "status", "destino", "dns", "conexão", "tls", "resposta", "total", "erro"]],
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "site": st.column_config.TextColumn("Site"),
+                    "status": st.column_config.NumberColumn("Status", format="%d"),
+                    "destino": st.column_config.TextColumn("Redirecionado para"),
+                    "dns": st.column_config.NumberColumn("DNS (ms)", format="%.0f"),
+                    "conexão": st.column_config.NumberColumn("Conexão (ms)", format="%.0f"),
+                    "tls": st.column_config.NumberColumn("TLS (ms)", format="%.0f"),
+                    "resposta": st.column_config.NumberColumn("Resposta (ms)", format="%.0f"),
+                    "total": st.column_config.NumberColumn("Total (ms)", format="%.0f"),
+                    "erro": st.column_config.TextColumn("Erro"),
+                },
+            )
 
 if st.session_state["romano"]:
-    msg_romano.markdown(f"O número convertido por romano é {alg_romano(st.session_state['romano'])}.")
+    try:
+        msg_romano.markdown(f"O número convertido por romano é {romano(int(st.session_state['romano']))}."
+                            if st.session_state["romano"].strip().isdigit() else
+                            f"O romano convertido em número é {arabico(st.session_state['romano'])}.")
+
+    except ValueError as erro:
+        msg_romano.markdown(f"{erro}")
 
 if st.session_state["fibonacci"]:
-    msg_fibonacci.markdown(f"A série de Fibonacci é {fibonacci(st.session_state['fibonacci'])}.")
+    termos: int = st.session_state["fibonacci"]
+    visiveis: str = ", ".join(map(str, islice(serie_fibonacci(), min(termos, 30))))
+    ultimo: str = notacao_cientifica(log10_fibonacci(termos - 1)) if log10_fibonacci(termos - 1) >= LIMITE_DIGITOS \
+        else f"{fibonacci(termos - 1)}"
+
+    msg_fibonacci.markdown(f"A série de Fibonacci é {visiveis}{', ...' if termos > 30 else ''}.</br>"
+                           f"O {termos}º termo é {ultimo}.", unsafe_allow_html=True)
 
 if st.session_state["prime"]:
-    divs = 0
+    try:
+        numero: int = int(st.session_state["prime"])
+
+    except ValueError:
+        msg_primo.markdown("Digite um número inteiro.")
 
-    for i in range(1, st.session_state["prime"] + 1):
-        if st.session_state["prime"] % i == 0:
-            divs += 1
+    else:
+        if len(str(abs(numero))) > LIMITE_DIGITOS_PRIMO:
+            msg_primo.markdown(f"Digite um número com até {LIMITE_DIGITOS_PRIMO} algarismos.")
 
-    msg_primo.markdown(f"O número {st.session_state['prime']} é primo!!!" if divs == 2
-                       else f"O número {st.session_state['prime']} não é primo!!!</br>"
-                            f"{st.session_state['prime']} é divisível por {divs} vez(es)...",
-                       unsafe_allow_html=True)
+        elif numero < 2:
+            msg_primo.markdown(f"O número {numero} não é primo!!!")
+
+        elif eh_primo(numero):
+            msg_primo.markdown(f"O número {numero} é primo!!!")
+
+        else:
+            fatores, resto = fatorar(numero)
+            divs: int = quantidade_divisores(fatores)
+
+            msg_primo.markdown(f"O número {numero} não é primo!!!</br>"
+                               f"{numero} = {fatoracao(fatores | ({resto: 1} if resto > 1 else {}))}</br>"
+                               + (f"{numero} tem {divs} divisores..." if resto == 1 else
+                                  f"O fator {resto} é composto, mas não foi decomposto a tempo..."),
+                               unsafe_allow_html=True)
 
 if st.session_state["palindrome"]:
     msg_palindrome.markdown(f"A palavra ou frase '{st.session_state['palindrome']}' "
@@ -215,7 +261,11 @@ if st.session_state["palindrome"]:
                                      truncar_texto(st.session_state['palindrome'][::-1]) else 'não'} é palíndromo!!!")
 
 if st.session_state["fatorial"]:
-    msg_fatorial.markdown(f"O fatorial de {st.session_state['fatorial']} é {fatorial(st.session_state['fatorial'])}.")
+    n_fatorial: int = st.session_state["fatorial"]
+    resultado: str = notacao_cientifica(log10_fatorial(n_fatorial)) if log10_fatorial(n_fatorial) >= LIMITE_DIGITOS \
+        else f"{fatorial(n_fatorial)}"
+
+    msg_fatorial.markdown(f"O fatorial de {n_fatorial} é {resultado}.", unsafe_allow_html=True)
 
 if st.session_state["calendar"]:
     msg_calendar.code(calendar.calendar(theyear=st.session_state["calendar"]))
@@ -3,11 +3,14 @@ from datetime import date
 
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 
-from apps import toggle_sidebar
-
-locale.setlocale(locale.LC_ALL, "pt_BR.UTF-8")
+from utils.analises import anomalias, soma_movel, variacao_anual
+from utils.contracheque import Cubo, acrescentar, carregar, versao
+from utils.graficos import CacheFiguras
+from utils.navegacao import paginas, toggle_sidebar
+from utils.perfil import perfilar, secao
 
 sort_months: list[str] = ["Jan", "Fev", "Mar", "Abr", "Mai", "Jun", "Jul", "Ago", "Set", "Out", "Nov", "Dez"]
 
@@ -15,64 +18,117 @@ path_lances: str = "~/Documents/lances.csv"
 path_mirrors: str = "~/Documents/mirrors.csv"
 
 
+@perfilar
 @st.cache_data(show_spinner="⏳Obtendo os dados, aguarde...")
 def get_release() -> dict[str: int]:
     load: pd.DataFrame = pd.read_csv(path_lances).sort_values(["lançamento"])
     return {value: key for key, value in zip(load["id_lançamento"].to_list(), load["lançamento"].to_list())}
 
 
+@perfilar
 @st.cache_data(show_spinner="⏳Obtendo os dados, aguarde...")
-def last_period() -> int:
-    return pd.read_csv(path_mirrors)["período"].max()
+def load_contracheque(versao_arquivos: tuple) -> pd.DataFrame:
+    return carregar(path_mirrors, path_lances)
+
+
+@perfilar
+@st.cache_data(show_spinner=False)
+def last_period(versao_arquivos: tuple) -> int:
+    return int(load_contracheque(versao_arquivos)["período"].max())
+
+
+versao_contracheque: tuple = versao(path_mirrors, path_lances)
+
+take_year: int = last_period(versao_contracheque) // 100
+take_month: int = last_period(versao_contracheque) % 100
 
 
-take_year: int = int(last_period() / 100)
-take_month: int = last_period() % 100
+@perfilar
+@st.cache_data(show_spinner="⏳Calculando as análises, aguarde...")
+def load_analises(versao_arquivos: tuple) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    load: pd.DataFrame = load_contracheque(versao_arquivos)
 
+    return soma_movel(load), variacao_anual(load), anomalias(load)
 
+
+@perfilar
 @st.cache_data(show_spinner="⏳Obtendo os dados, aguarde...")
-def load_extract_monthly(receive_year: int, receive_month: int) -> pd.DataFrame:
-    load: pd.DataFrame = pd.read_csv(path_mirrors).merge(pd.read_csv(path_lances), how="inner", on=["id_lançamento"])
-    load.columns = [str(coluna).capitalize() for coluna in load.columns]
-    load["Ano"] = pd.to_datetime(load["Período"], format="%Y%m").dt.year
-    load["Mês"] = pd.to_datetime(load["Período"], format="%Y%m").dt.month
-    load = load[load["Ano"].eq(receive_year) & load["Mês"].eq(receive_month)]
-    load = load[["Lançamento", "Período", "Acerto", "Valor"]]
+def load_extract_monthly(versao_arquivos: tuple, receive_year: int, receive_month: int) -> pd.DataFrame:
+    load: pd.DataFrame = load_contracheque(versao_arquivos)
+    load = load[load["ano"].eq(receive_year) & load["mês"].eq(receive_month) & load["lançamento"].notna()]
+    load = load[["lançamento", "período", "acerto", "valor"]]
+    load.columns = ["Lançamento", "Período", "Acerto", "Valor"]
     load["Período"] = pd.to_datetime(load["Período"], format="%Y%m").dt.strftime("%B de %Y")
     load.sort_values(["Acerto", "Valor"], ascending=[False, False], inplace=True)
 
     return load
 
 
-@st.cache_data(show_spinner="⏳Obtendo os dados, aguarde...")
-def load_extract_annual(receive_year: int) -> pd.DataFrame:
-    load: pd.DataFrame = pd.read_csv(path_mirrors).merge(pd.read_csv(path_lances), how="inner", on=["id_lançamento"])
-    load.columns = [str(coluna).capitalize() for coluna in load.columns]
-    load["Ano"] = pd.to_datetime(load["Período"], format="%Y%m").dt.year
-    load = load[load["Ano"].eq(receive_year)][["Lançamento", "Período", "Acerto", "Valor"]]
-    load["Mês"] = pd.to_datetime(load["Período"], format="%Y%m").dt.strftime("%b")
-    load = load.pivot(columns="Mês", index=["Lançamento", "Acerto"], values="Valor").reset_index().fillna(value=0)
-    load = load.reindex(columns=["Lançamento", "Acerto"] + [month for month in sort_months if month in load.columns])
-    load["Média"] = load[load.columns[2:]].mean(axis=1)
-    load["Total"] = load[load.columns[2:-1]].sum(axis=1)
-    load = load.sort_values(["Acerto", "Total"], ascending=[False, False])
+@st.cache_resource(show_spinner=False)
+def load_cubo() -> Cubo:
+    return Cubo()
 
-    return load
 
+cubo: Cubo = load_cubo()
 
-@st.cache_data(show_spinner="⏳Obtendo os dados, aguarde...")
-def load_total_annual() -> pd.DataFrame:
-    load: pd.DataFrame = pd.read_csv(path_mirrors)
-    load.columns = [str(coluna).capitalize() for coluna in load.columns]
-    load = load.groupby(["Período"])["Valor"].sum().reset_index()
-    load["Ano"] = pd.to_datetime(load["Período"], format="%Y%m").dt.year
-    load["Mês"] = pd.to_datetime(load["Período"], format="%Y%m").dt.strftime("%b")
-    load = load.pivot(columns="Mês", index="Ano", values="Valor").fillna(0)
-    load = load.reindex(columns=[month for month in sort_months if month in load.columns])
-    load["Média"] = load.mean(axis=1)
-    load["Total"] = load[load.columns[:-1]].sum(axis=1)
+if cubo.versao != versao_contracheque:
+    with secao("cubo.reconstruir"):
+        cubo.reconstruir(load_contracheque(versao_contracheque), versao_contracheque)
+
+
+@st.cache_resource(show_spinner=False)
+def load_figuras() -> CacheFiguras:
+    return CacheFiguras()
+
+
+def build_graphic(total: pd.DataFrame, ano: int, tema: str) -> go.Figure:
+    salario: pd.DataFrame = total[total.columns[:-2]] \
+        .loc[ano] \
+        .reset_index() \
+        .rename(columns={ano: "salário"})
+
+    fig = px.bar(
+        data_frame=salario,
+        x="Mês",
+        y="salário",
+        title=f"Espelho {ano}",
+        text=salario["salário"].apply(lambda x: locale.currency(x, grouping=True)),
+        color="salário",
+        color_continuous_scale="Viridis"
+    )
+
+    fig.update_layout(
+        xaxis_title="",
+        yaxis_title="",
+        xaxis=dict(
+            showline=True,
+            linewidth=1,
+            linecolor="gray",
+            showgrid=True
+        ),
+        yaxis=dict(showticklabels=False),
+        showlegend=False,
+        coloraxis_showscale=True,
+        template="presentation",
+        margin=dict(l=0, r=0, t=30, b=0),
+        font=dict(size=13, color="white" if tema == "dark" else "black"),
+    )
+
+    fig.update_traces(textposition="outside")
+
+    return fig
 
-    return load
+
+figuras: CacheFiguras = load_figuras()
+tema: str = st.context.theme.type or "light"
+total_anual: pd.DataFrame = cubo.total_anual(sort_months)
+
+figuras.descartar(lambda chave: chave[0] == cubo.versao)
+figuras.preaquecer(
+    (cubo.versao, tema),
+    [(cubo.versao, int(ano), tema) for ano in total_anual.index],
+    lambda chave: build_graphic(total_anual, chave[1], chave[2]),
+)
 
 
 @st.dialog(title=f"Inclusão do Mês de {date.today():%B}", width="large")
@@ -120,22 +176,29 @@ def new_data() -> None:
     if st.session_state["save"]:
         if st.session_state["editor"]["added_rows"]:
             for row in st.session_state["editor"]["added_rows"]:
+                row["lançamento"] = row["id_lançamento"]
                 row["id_lançamento"] = get.get(row["id_lançamento"])
 
             new_registers: pd.DataFrame = pd.DataFrame(st.session_state["editor"]["added_rows"])
-            new_registers = pd.concat([pd.read_csv(path_mirrors), new_registers], ignore_index=True)
-            new_registers.to_csv(path_mirrors, index=False)
+            acrescentar(path_mirrors, new_registers)
+
+            cubo.acrescentar(new_registers)
+            cubo.versao = versao(path_mirrors, path_lances)
+
+            # só os caches que dependem de mirrors.csv
+            for load in [load_contracheque, last_period, load_extract_monthly, load_analises]:
+                load.clear()
 
-            st.cache_data.clear()
             st.rerun()
 
     if st.session_state["cancel"]:
         st.rerun()
 
 
-tab1, tab2, tab3, tab4 = st.tabs(["**Extrato Mensal**", "**Extrato Anual**", "**Total Anual**", "**Gráfico**"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["**Extrato Mensal**", "**Extrato Anual**", "**Total Anual**", "**Gráfico**",
+                                        "**Análises**"])
 
-with tab1:
+with tab1, secao("Extrato Mensal"):
     col1, col2 = st.columns([1, 2])
 
     with col1:
@@ -153,13 +216,14 @@ with tab1:
 
     with col2:
         st.data_editor(
-            data=load_extract_monthly(st.session_state["select_year"], st.session_state["slider_months"]),
+            data=load_extract_monthly(versao_contracheque, st.session_state["select_year"],
+                                      st.session_state["slider_months"]),
             use_container_width=True,
             hide_index=True,
             column_config={"Valor": st.column_config.NumberColumn(format="dollar")},
         )
 
-with tab2:
+with tab2, secao("Extrato Anual"):
     st.slider(
         label="**Ano:**",
         min_value=2005,
@@ -168,7 +232,7 @@ with tab2:
         key="slider_years",
     )
 
-    df2: pd.DataFrame = load_extract_annual(st.session_state["slider_years"])
+    df2: pd.DataFrame = cubo.extrato_anual(st.session_state["slider_years"], sort_months)
 
     st.data_editor(
         data=df2,
@@ -178,8 +242,8 @@ with tab2:
                        for key in df2.columns if key not in ["Lançamento", "Acerto"]},
     )
 
-with tab3:
-    df3: pd.DataFrame = load_total_annual()
+with tab3, secao("Total Anual"):
+    df3: pd.DataFrame = total_anual
 
     with st.container():
         st.data_editor(
@@ -188,7 +252,7 @@ with tab3:
             column_config={key: st.column_config.NumberColumn(format="dollar") for key in df3.columns},
         )
 
-with tab4:
+with tab4, secao("Gráfico"):
     st.slider(
         label="**Ano:**",
         min_value=2005,
@@ -197,42 +261,52 @@ with tab4:
         key="slider_graphic",
     )
 
-    df4: pd.DataFrame = load_total_annual()
-    df4 = df4[df4.columns[:-2]] \
-        .loc[st.session_state["slider_graphic"]] \
-        .reset_index() \
-        .rename(columns={st.session_state["slider_graphic"]: "salário"})
-
-    fig = px.bar(
-        data_frame=df4,
-        x="Mês",
-        y="salário",
-        title=f"Espelho {st.session_state["slider_graphic"]}",
-        text=df4["salário"].apply(lambda x: locale.currency(x, grouping=True)),
-        color="salário",
-        color_continuous_scale="Viridis"
+    fig: dict = figuras.obter(
+        (cubo.versao, st.session_state["slider_graphic"], tema),
+        lambda: build_graphic(total_anual, st.session_state["slider_graphic"], tema),
     )
 
-    fig.update_layout(
-        xaxis_title="",
-        yaxis_title="",
-        xaxis=dict(
-            showline=True,
-            linewidth=1,
-            linecolor="gray",
-            showgrid=True
-        ),
-        yaxis=dict(showticklabels=False),
-        showlegend=False,
-        coloraxis_showscale=True,
-        template="presentation",
-        margin=dict(l=0, r=0, t=30, b=0),
-        font=dict(size=13, color="black"),
-    )
+    st.plotly_chart(fig, use_container_width=True)
 
-    fig.update_traces(textposition="outside")
+with tab5, secao("Análises"):
+    movel, anual, fora_da_faixa = load_analises(versao_contracheque)
 
-    st.plotly_chart(fig, use_container_width=True)
+    st.write("**Salário mensal e soma dos últimos 12 meses**")
+    st.line_chart(movel, x="mês", y=["total", "soma_12_meses"])
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.selectbox(label="**Ano:**", options=range(take_year, 2005, -1), key="select_year_analises")
+
+        st.dataframe(
+            data=anual[anual["ano"].eq(st.session_state["select_year_analises"])].drop(columns=["ano"]),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "lançamento": st.column_config.TextColumn(label="Lançamento"),
+                "total": st.column_config.NumberColumn(label="Total", format="dollar"),
+                "variação": st.column_config.NumberColumn(label="Variação", format="dollar"),
+                "percentual": st.column_config.NumberColumn(label="Variação %", format="percent"),
+            },
+        )
+
+    with col2:
+        st.write("**Lançamentos fora da faixa usual**")
+
+        st.dataframe(
+            data=fora_da_faixa,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "lançamento": st.column_config.TextColumn(label="Lançamento"),
+                "período": st.column_config.NumberColumn(label="Período", format="%d"),
+                "acerto": st.column_config.CheckboxColumn(label="Acerto"),
+                "valor": st.column_config.NumberColumn(label="Valor", format="dollar"),
+                "mediana": st.column_config.NumberColumn(label="Mediana", format="dollar"),
+                "escore": st.column_config.NumberColumn(label="Escore", format="%.1f"),
+            },
+        )
 
 if st.button("**Voltar**", key="back", type="primary", icon=":material/reply:", on_click=toggle_sidebar):
-    st.switch_page("apps.py")
+    st.switch_page(paginas()["home"])
@@ -1,12 +1,16 @@
 import locale
 from datetime import date
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-from apps import toggle_sidebar
-
-locale.setlocale(locale.LC_ALL, "pt_BR.UTF-8")
+from utils.estatisticas import Estatisticas, atualizar
+from utils.megasena import (apostas_to_masks, carregar, chave_planilha, conferir_lote, indice_mensal, indice_virada,
+                            ler_apostas, mask_to_bolas, score_apostas)
+from utils.navegacao import paginas, toggle_sidebar
+from utils.perfil import perfilar, secao
+from utils.simulacao import Resultado, distribuicao_exata, retorno_esperado_exato, simular
 
 minhas_apostas: list[str] = [
     "05 15 26 27 46 53",  # aposta n.° 1
@@ -29,40 +33,63 @@ minhas_apostas: list[str] = [
     "01 16 21 34 49 54",  # aposta n.° 18
 ]
 
+mascaras_apostas: np.ndarray = apostas_to_masks(minhas_apostas)
+
 
+@perfilar
 @st.cache_data(show_spinner="⏳Obtendo os dados, aguarde...")
-def load_megasena() -> pd.DataFrame:
-    df: pd.DataFrame = pd.read_excel(io=st.session_state["xlsx_file"], engine="openpyxl")
+def load_megasena(versao: str) -> pd.DataFrame:
+    return carregar(st.session_state["xlsx_file"].getvalue(), versao)
 
-    for coluna in df.columns[2:8]:
-        df[coluna] = df[coluna].astype(str).str.zfill(2)
 
-    df["bolas"] = df[df.columns[2:8]].apply(" ".join, axis=1)
+@perfilar
+@st.cache_data(show_spinner=False)
+def load_indice_mensal(versao: str) -> dict[tuple[int, int], slice]:
+    return indice_mensal(load_megasena(versao))
 
-    for coluna in ["Rateio 6 acertos", "Rateio 5 acertos", "Rateio 4 acertos"]:
-        df[coluna] = df[coluna].astype(str).str.replace(r"\D", "", regex=True).astype(float) / 100
 
-    df = df[["Concurso", "Data do Sorteio", "bolas", "Ganhadores 6 acertos", "Rateio 6 acertos",
-             "Ganhadores 5 acertos", "Rateio 5 acertos", "Ganhadores 4 acertos", "Rateio 4 acertos"]]
-    df.columns = ["id_sorteio", "dt_sorteio", "bolas", "acerto_6", "rateio_6",
-                  "acerto_5", "rateio_5", "acerto_4", "rateio_4"]
-    df.set_index(["id_sorteio"], inplace=True)
-    df.loc[2701] = ["16/03/2024", "06 15 18 31 32 47", 0, 0.0, 72, 59349.01, 5712, 1068.7]
-    df["dt_sorteio"] = pd.to_datetime(df["dt_sorteio"], format="%d/%m/%Y")
-    df = df.reset_index().sort_values(by=["id_sorteio", "dt_sorteio"], ignore_index=True)
+@perfilar
+@st.cache_data(show_spinner=False)
+def load_mes(versao: str, ano: int, mes: int) -> pd.DataFrame:
+    fatia: slice = load_indice_mensal(versao).get((ano, mes), slice(0, 0))
+
+    df: pd.DataFrame = load_megasena(versao).iloc[fatia].reset_index(drop=True)
+    df["dt_sorteio"] = df["dt_sorteio"].dt.strftime("%x (%a)")
 
     return df
 
 
+@perfilar
+@st.cache_data(show_spinner=False)
+def load_virada(versao: str, ano_atual: int) -> pd.DataFrame:
+    megasena: pd.DataFrame = load_megasena(versao)
+    virada: pd.Series = indice_virada(megasena).drop(ano_atual, errors="ignore")
+
+    df: pd.DataFrame = megasena.iloc[megasena["id_sorteio"].searchsorted(virada.to_numpy())].reset_index(drop=True)
+    df["dt_sorteio"] = df["dt_sorteio"].dt.strftime("%x (%a)")
+
+    return df
+
+
+@perfilar
+@st.cache_data(show_spinner="⏳Calculando as estatísticas, aguarde...")
+def load_estatisticas(versao: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    estatisticas: Estatisticas = atualizar(load_megasena(versao))
+
+    return estatisticas.tabela(), estatisticas.pares()
+
+
 st.columns(3)[0].file_uploader("Importar", type="xlsx", key="xlsx_file", label_visibility="hidden")
 
 if st.session_state["xlsx_file"] and st.session_state["xlsx_file"].name == "Mega-Sena.xlsx":
-    megasena: pd.DataFrame = load_megasena()
+    versao: str = chave_planilha(st.session_state["xlsx_file"].getvalue())
+    megasena: pd.DataFrame = load_megasena(versao)
 
-    tab0, tab1, tab2, tab3 = st.tabs(["**Apostas Sorteadas**", "**Minhas apostas**",
-                                      "**Sua aposta da Mega-Sena**", "**Mega-Sena da Virada**"])
+    tab0, tab1, tab2, tab3, tab4 = st.tabs(["**Apostas Sorteadas**", "**Minhas apostas**",
+                                            "**Sua aposta da Mega-Sena**", "**Mega-Sena da Virada**",
+                                            "**Estatísticas**"])
 
-    with tab0:
+    with tab0, secao("Apostas Sorteadas"):
         col = st.columns([1, 4])
 
         with col[0]:
@@ -70,9 +97,7 @@ if st.session_state["xlsx_file"] and st.session_state["xlsx_file"].name == "Mega
             st.selectbox("**Ano:**", options=range(date.today().year, 1995, -1), key="year_tab0")
 
         with col[1]:
-            all_mega: pd.DataFrame = megasena[megasena["dt_sorteio"].dt.year.eq(st.session_state["year_tab0"]) &
-                                              megasena["dt_sorteio"].dt.month.eq(st.session_state["month_tab0"])].copy()
-            all_mega["dt_sorteio"] = all_mega["dt_sorteio"].dt.strftime("%x (%a)")
+            all_mega: pd.DataFrame = load_mes(versao, st.session_state["year_tab0"], st.session_state["month_tab0"])
 
             st.data_editor(
                 data=all_mega,
@@ -88,12 +113,13 @@ if st.session_state["xlsx_file"] and st.session_state["xlsx_file"].name == "Mega
                     "rateio_5": st.column_config.NumberColumn(label="Rateio de 5", format="dollar"),
                     "acerto_4": st.column_config.NumberColumn(label="Acerto de 4"),
                     "rateio_4": st.column_config.NumberColumn(label="Rateio de 4", format="dollar"),
+                    "mascara": None,
                 },
                 key="de_all_mega",
                 row_height=25,
             )
 
-    with tab1:
+    with tab1, secao("Minhas apostas"):
         col1, col2 = st.columns([1.3, 2.8])
 
         with col1:
@@ -109,25 +135,55 @@ if st.session_state["xlsx_file"] and st.session_state["xlsx_file"].name == "Mega
                 row_height=25,
             )
 
+            with st.expander("**Simulação da carteira**", icon=":material/casino:"):
+                st.number_input("**Sorteios simulados:**", min_value=10_000, max_value=50_000_000, value=1_000_000,
+                                step=1_000_000, key="qtd_simulacao")
+
+                # rateio típico de cada faixa, sem os concursos em que ninguém ganhou
+                rateios: np.ndarray = megasena[["rateio_6", "rateio_5", "rateio_4"]] \
+                    .replace(0, np.nan).median().to_numpy()
+
+                if st.button("**Simular**", key="btn_simular", type="primary", icon=":material/play_arrow:"):
+                    with st.spinner("Simulando os sorteios, aguarde...", show_time=True), secao("simular"):
+                        simulado: Resultado = simular(mascaras_apostas, rateios, st.session_state["qtd_simulacao"])
+
+                    st.dataframe(
+                        data={
+                            "Acertos": list(range(7)),
+                            "Carteira (simulado)": simulado.melhor / simulado.sorteios,
+                            "Por aposta (simulado)": simulado.distribuicao.sum(axis=0) / simulado.distribuicao.sum(),
+                            "Por aposta (exato)": distribuicao_exata(6),
+                        },
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            coluna: st.column_config.NumberColumn(format="%.6f")
+                            for coluna in ["Carteira (simulado)", "Por aposta (simulado)", "Por aposta (exato)"]
+                        },
+                    )
+
+                    st.write(f"Custo por concurso: {locale.currency(simulado.custo, grouping=True)}")
+                    st.write(f"Retorno esperado simulado: "
+                             f"{locale.currency(simulado.retorno_esperado, grouping=True)}")
+                    st.write(f"Retorno esperado exato: "
+                             f"{locale.currency(retorno_esperado_exato(mascaras_apostas, rateios), grouping=True)}")
+
         with col2:
+            with secao("score_apostas"):
+                acertos: np.ndarray = score_apostas(megasena["mascara"].to_numpy(), mascaras_apostas)
+
             for r in range(6, 3, -1):
                 st.write(f"**Acerto de {r} bolas**")
 
-                mega_copy: dict[str, list[int | str]] = {"Concurso": [], "Data do Sorteio": [],
-                                                         "Suas bolas acertadas": [], "Sua aposta n.°": []}
+                sorteios, apostas = np.nonzero(acertos == r)
 
-                for row in megasena[["id_sorteio", "dt_sorteio", "bolas", f"acerto_{r}", f"rateio_{r}"]].copy() \
-                        .itertuples(index=False, name=None):
-                    for aposta in minhas_apostas:
-                        bolas: list[str] = aposta.split()
-
-                        match: list[str] = [bolas[x] for x in range(6) if bolas[x] in row[2]]
-
-                        if len(match) == r:
-                            mega_copy["Concurso"].append(str(row[0]).zfill(4))
-                            mega_copy["Data do Sorteio"].append(row[1].strftime("%x (%a)"))
-                            mega_copy["Suas bolas acertadas"].append(" ".join(match))
-                            mega_copy["Sua aposta n.°"].append(minhas_apostas.index(aposta) + 1)
+                mega_copy: dict[str, list[int | str]] = {
+                    "Concurso": megasena["id_sorteio"].iloc[sorteios].map("{:04d}".format).to_list(),
+                    "Data do Sorteio": megasena["dt_sorteio"].iloc[sorteios].dt.strftime("%x (%a)").to_list(),
+                    "Suas bolas acertadas": [mask_to_bolas(mascara) for mascara in
+                                             megasena["mascara"].to_numpy()[sorteios] & mascaras_apostas[apostas]],
+                    "Sua aposta n.°": (apostas + 1).tolist(),
+                }
 
                 st.columns([2.5, 0.5])[0].dataframe(
                     data=mega_copy,
@@ -137,46 +193,71 @@ if st.session_state["xlsx_file"] and st.session_state["xlsx_file"].name == "Mega
                     row_height=25,
                 )
 
-    with tab2:
+    with tab2, secao("Sua aposta da Mega-Sena"):
         st.columns(5)[0].text_input("Sua aposta:", key="sua_aposta", placeholder="Ex: 01 02 03 04 05 06")
 
         st.button("**Acertei?**", key="btn_acertas", type="primary")
 
-        mega_copy2: dict[str, list[int | str]] = {"Concurso": [], "Data de Sorteio": [],
-                                                  "Bolas Sorteadas": [], "Seus Acertos": []}
-
         if st.session_state["btn_acertas"]:
             if st.session_state["sua_aposta"]:
-                with st.spinner("Obtendo as apostas, aguarde...", show_time=True):
-                    for row in megasena.copy().itertuples(index=False, name=None):
-                        match: list[str] = [aposta for aposta in st.session_state["sua_aposta"].split()
-                                            if aposta in row[2]]
-
-                        if len(match) >= 4:
-                            mega_copy2["Concurso"].append(str(row[0]).zfill(4))
-                            mega_copy2["Data de Sorteio"].append(row[1].strftime("%x (%a)"))
-                            mega_copy2["Bolas Sorteadas"].append(row[2])
-                            mega_copy2["Seus Acertos"].append(len(match))
-
-                st.columns([2.5, 1, 1])[0].data_editor(
-                    data=mega_copy2,
+                try:
+                    sua_aposta: np.ndarray = apostas_to_masks([st.session_state["sua_aposta"]])
+
+                except ValueError:
+                    st.toast("**Digite apenas bolas de 01 a 60!**", icon=":material/warning:")
+
+                else:
+                    acertos_aposta: np.ndarray = score_apostas(megasena["mascara"].to_numpy(), sua_aposta)[:, 0]
+                    sorteados: pd.DataFrame = megasena.iloc[np.flatnonzero(acertos_aposta >= 4)]
+
+                    mega_copy2: dict[str, list[int | str]] = {
+                        "Concurso": sorteados["id_sorteio"].map("{:04d}".format).to_list(),
+                        "Data de Sorteio": sorteados["dt_sorteio"].dt.strftime("%x (%a)").to_list(),
+                        "Bolas Sorteadas": sorteados["bolas"].to_list(),
+                        "Seus Acertos": acertos_aposta[acertos_aposta >= 4].tolist(),
+                    }
+
+                    st.columns([2.5, 1, 1])[0].data_editor(
+                        data=mega_copy2,
+                        use_container_width=True,
+                        hide_index=True,
+                        key="de_acertas",
+                        row_height=25,
+                    )
+
+            else:
+                st.toast("**Preencha suas bolas!**", icon=":material/warning:")
+
+        st.columns(3)[0].file_uploader("**Apostas do bolão (uma por linha):**", type=["csv", "txt"], key="csv_apostas")
+
+        if st.session_state["csv_apostas"]:
+            try:
+                apostas_bolao: list[str] = ler_apostas(st.session_state["csv_apostas"].getvalue().decode("utf-8"))
+
+            except ValueError as error:
+                st.toast(f"**{error}**", icon=":material/warning:")
+
+            else:
+                with st.spinner("Conferindo as apostas, aguarde...", show_time=True):
+                    bolao: pd.DataFrame = conferir_lote(megasena, apostas_bolao)
+
+                st.dataframe(
+                    data=bolao,
                     use_container_width=True,
                     hide_index=True,
-                    key="de_acertas",
+                    column_config={
+                        "aposta": st.column_config.TextColumn(label="Aposta"),
+                        "qtd_bolas": st.column_config.NumberColumn(label="Bolas"),
+                        "acerto_6": st.column_config.NumberColumn(label="Senas"),
+                        "acerto_5": st.column_config.NumberColumn(label="Quinas"),
+                        "acerto_4": st.column_config.NumberColumn(label="Quadras"),
+                        "premio": st.column_config.NumberColumn(label="Rateio ganho", format="dollar"),
+                    },
                     row_height=25,
                 )
 
-            else:
-                st.toast("**Preencha suas bolas!**", icon=":material/warning:")
-
-    with tab3:
-        mega_da_virada: pd.DataFrame = megasena.copy()
-        mega_da_virada["ano"] = mega_da_virada["dt_sorteio"].dt.year
-        mega_da_virada = mega_da_virada[mega_da_virada["dt_sorteio"]. \
-            isin(mega_da_virada[mega_da_virada["ano"] != pd.Timestamp.now().year]. \
-                 groupby(["ano"])["dt_sorteio"].transform("max"))].reset_index(drop=True). \
-            drop(["ano"], axis=1)
-        mega_da_virada["dt_sorteio"] = mega_da_virada["dt_sorteio"].dt.strftime("%x (%a)")
+    with tab3, secao("Mega-Sena da Virada"):
+        mega_da_virada: pd.DataFrame = load_virada(versao, date.today().year)
 
         st.data_editor(
             data=mega_da_virada,
@@ -192,10 +273,46 @@ if st.session_state["xlsx_file"] and st.session_state["xlsx_file"].name == "Mega
                 "rateio_5": st.column_config.NumberColumn(label="Rateio de 5", format="dollar"),
                 "acerto_4": st.column_config.NumberColumn(label="Acerto de 4"),
                 "rateio_4": st.column_config.NumberColumn(label="Rateio de 4", format="dollar"),
+                "mascara": None,
             },
             key="de_mega_da_virada",
             row_height=25,
         )
 
+    with tab4, secao("Estatísticas"):
+        frequencia, pares = load_estatisticas(versao)
+
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            st.write("**Frequência e atraso das bolas**")
+
+            st.dataframe(
+                data=frequencia,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "bola": st.column_config.NumberColumn(label="Bola", format="%02d"),
+                    "frequencia": st.column_config.NumberColumn(label="Sorteada"),
+                    "percentual": st.column_config.ProgressColumn(label="% dos sorteios", format="percent"),
+                    "atraso": st.column_config.NumberColumn(label="Sorteios sem sair"),
+                },
+                row_height=25,
+            )
+
+        with col2:
+            st.write("**Pares que mais saíram juntos**")
+
+            st.dataframe(
+                data=pares,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "par": st.column_config.TextColumn(label="Par"),
+                    "vezes": st.column_config.NumberColumn(label="Vezes"),
+                },
+                row_height=25,
+            )
+
 if st.button("**Voltar**", key="back", type="primary", icon=":material/reply:", on_click=toggle_sidebar):
-    st.switch_page("apps.py")
+    st.switch_page(paginas()["home"])
@@ -3,33 +3,81 @@ from datetime import date
 import pandas as pd
 import streamlit as st
 
-from apps import toggle_sidebar
+from utils.duplicados import grupos_duplicados
+from utils.navegacao import paginas, toggle_sidebar
+from utils.perfil import perfilar, secao
+from utils.unibb import Cubo, aplicar, ler, operacoes, para_editor, registrar, versao
 
 file_csv: str = "~/Documents/unibb.csv"
 
-unibb: pd.DataFrame = pd.read_csv(file_csv, parse_dates=["dt_curso"])
 
-if "unibb" not in st.session_state:
-    st.session_state["unibb"] = unibb
+@perfilar
+@st.cache_data(show_spinner="⏳Obtendo os dados, aguarde...", max_entries=2)
+def load_unibb(versao_arquivos: tuple) -> pd.DataFrame:
+    return ler(file_csv)
 
 
-def save_csv(frame: pd.DataFrame) -> None:
-    if unibb.equals(frame):
+@perfilar
+@st.cache_data(show_spinner="⏳Procurando cursos duplicados, aguarde...", max_entries=2)
+def load_duplicados(versao_arquivos: tuple, _unibb: pd.DataFrame) -> pd.DataFrame:
+    load: pd.DataFrame = _unibb.assign(grupo=grupos_duplicados(_unibb["nm_curso"]))
+
+    return load[load["grupo"].notna()].sort_values(by=["grupo", "dt_curso"])
+
+
+@perfilar
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_editor(versao_arquivos: tuple, _unibb: pd.DataFrame) -> pd.DataFrame:
+    return para_editor(_unibb)
+
+
+versao_unibb: tuple = versao(file_csv)
+
+# a mesma cópia alimenta as duas abas; só é relida quando o CSV ou o journal mudam por fora
+if st.session_state.get("versao_unibb") != versao_unibb:
+    st.session_state["unibb"] = load_unibb(versao_unibb)
+    st.session_state["versao_unibb"] = versao_unibb
+    st.session_state["editor_unibb"] = st.session_state.get("editor_unibb", -1) + 1
+
+unibb: pd.DataFrame = st.session_state["unibb"]
+
+
+@st.cache_resource(show_spinner=False)
+def load_cubo_horas() -> Cubo:
+    return Cubo()
+
+
+cubo: Cubo = load_cubo_horas()
+
+if cubo.versao != st.session_state["versao_unibb"]:
+    with secao("cubo.reconstruir"):
+        cubo.reconstruir(unibb, st.session_state["versao_unibb"])
+
+
+def save_csv() -> None:
+    ops: list[dict] = operacoes(st.session_state["unibb"],
+                                st.session_state.get(f"de_unibb_{st.session_state["editor_unibb"]}", {}))
+
+    if not ops:
         st.toast("**A planilha não foi alterada...**", icon=":material/error:")
 
     else:
-        frame["id_curso"] = frame["id_curso"].astype(int)
-        frame["cg_curso"] = frame["cg_curso"].astype(int)
-        frame.to_csv(file_csv, index=False)
-        st.cache_data.clear()
+        registrar(file_csv, ops)
+        anterior: pd.DataFrame = st.session_state["unibb"]
+        st.session_state["unibb"] = aplicar(anterior, ops)
+        st.session_state["versao_unibb"] = versao(file_csv)
+
+        cubo.atualizar(anterior, st.session_state["unibb"], ops)
+        cubo.versao = st.session_state["versao_unibb"]
+        st.session_state["editor_unibb"] += 1  # editor novo, sem o delta já salvo
         st.toast("**Planilha alterada com sucesso!**", icon=":material/check_circle:")
 
 
-tab1, tab2 = st.tabs(["**Cursos da UniBB**", "**Cursos Duplicados**"])
+tab1, tab2, tab3 = st.tabs(["**Cursos da UniBB**", "**Cursos Duplicados**", "**Horas de Treinamento**"])
 
-with tab1:
-    editor = st.data_editor(
-        data=st.session_state["unibb"],
+with tab1, secao("Cursos da UniBB"):
+    st.data_editor(
+        data=load_editor(st.session_state["versao_unibb"], st.session_state["unibb"]),
         hide_index=True,
         column_config={
             "id_curso": st.column_config.NumberColumn("Código", width="small", required=True),
@@ -43,20 +91,22 @@ with tab1:
             "area_cnh_curso": st.column_config.TextColumn("Área", width="medium", required=True),
         },
         num_rows="dynamic",
+        key=f"de_unibb_{st.session_state["editor_unibb"]}",
         row_height=25,
     )
 
-    st.button("**Adicionar**", type="primary", icon=":material/add_circle:", on_click=save_csv, args=(editor,))
+    st.button("**Adicionar**", type="primary", icon=":material/add_circle:", on_click=save_csv)
 
 if st.button("**Voltar**", key="back", type="primary", icon=":material/reply:", on_click=toggle_sidebar):
-    st.switch_page("apps.py")
+    st.switch_page(paginas()["home"])
 
-with tab2:
+with tab2, secao("Cursos Duplicados"):
     st.dataframe(
-        data=unibb[unibb.duplicated(subset=["nm_curso"], keep=False)].sort_values(by=["nm_curso", "dt_curso"],),
+        data=load_duplicados(st.session_state["versao_unibb"], st.session_state["unibb"]),
         hide_index=True,
         use_container_width=True,
         column_config={
+            "grupo": st.column_config.NumberColumn("Grupo", format="%d"),
             "id_curso": st.column_config.NumberColumn("Código"),
             "nm_curso": st.column_config.TextColumn("Nome", width="medium"),
             "dt_curso": st.column_config.DateColumn("Conclusão", format="DD/MM/YYYY"),
@@ -67,3 +117,27 @@ with tab2:
             "area_cnh_curso": st.column_config.TextColumn("Área", width="medium"),
         },
     )
+
+with tab3, secao("Horas de Treinamento"):
+    dimensoes: dict[str, str] = {"Área": "area_cnh_curso", "Conhecimento": "cnh_curso", "Estudo": "lzc_curso"}
+    anos: list[int] = sorted(cubo.celulas.index.unique(level="ano"), reverse=True)
+
+    col1, col2 = st.columns([2, 1])
+    col1.multiselect(label="**Anos:**", options=anos, default=anos, key="anos_horas")
+    col2.radio(label="**Agrupar por:**", options=dimensoes.keys(), horizontal=True, key="dimensao_horas")
+
+    dimensao: str = dimensoes[st.session_state["dimensao_horas"]]
+    por_ano: pd.DataFrame = cubo.horas(["ano", dimensao], st.session_state["anos_horas"])
+
+    st.bar_chart(por_ano, x="ano", y="horas", color=dimensao, x_label="", y_label="Horas")
+
+    st.dataframe(
+        data=cubo.horas([dimensao], st.session_state["anos_horas"]).sort_values(by="horas", ascending=False),
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            dimensao: st.column_config.TextColumn(st.session_state["dimensao_horas"], width="medium"),
+            "horas": st.column_config.NumberColumn("Carga Horária"),
+            "cursos": st.column_config.NumberColumn("Cursos"),
+        },
+    )
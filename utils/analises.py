@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+
+def totais_mensais(df: pd.DataFrame) -> pd.Series:
+    """Total de cada mês, inclusive os meses sem lançamentos (zerados), indexado por período mensal."""
+    total: pd.Series = df.groupby("período")["valor"].sum()
+    total.index = pd.to_datetime(total.index.astype(str), format="%Y%m").to_period("M")
+
+    return total.reindex(pd.period_range(total.index.min(), total.index.max(), freq="M"), fill_value=0.0)
+
+
+def soma_movel(df: pd.DataFrame, janela: int = 12) -> pd.DataFrame:
+    total: pd.Series = totais_mensais(df)
+
+    return pd.DataFrame({
+        "mês": total.index.to_timestamp(),
+        "total": total.to_numpy(),
+        f"soma_{janela}_meses": total.rolling(janela, min_periods=janela).sum().to_numpy(),
+    })
+
+
+def variacao_anual(df: pd.DataFrame) -> pd.DataFrame:
+    """Total anual de cada lançamento e a variação em relação ao ano anterior."""
+    anual: pd.DataFrame = df[df["lançamento"].notna()] \
+        .groupby(["lançamento", "ano"], observed=True)["valor"].sum() \
+        .unstack(fill_value=0.0)
+    anual = anual.reindex(columns=range(anual.columns.min(), anual.columns.max() + 1), fill_value=0.0)
+
+    valores: np.ndarray = anual.to_numpy()
+    anterior: np.ndarray = np.hstack([np.full((len(anual), 1), np.nan), valores[:, :-1]])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentual: np.ndarray = np.where(anterior != 0, (valores - anterior) / np.abs(anterior), np.nan)
+
+    return pd.DataFrame({
+        "lançamento": np.repeat(anual.index.astype(str), anual.shape[1]),
+        "ano": np.tile(anual.columns.to_numpy(), len(anual)),
+        "total": valores.ravel(),
+        "variação": (valores - anterior).ravel(),
+        "percentual": percentual.ravel(),
+    })
+
+
+def anomalias(df: pd.DataFrame, limite: float = 3.5) -> pd.DataFrame:
+    """Lançamentos fora da faixa usual do próprio item, pelo z-score robusto (mediana e MAD)."""
+    nomeados: pd.DataFrame = df[df["lançamento"].notna()]
+    grupos = nomeados.groupby("lançamento", observed=True)["valor"]
+
+    mediana: pd.Series = grupos.transform("median")
+    mad: pd.Series = (nomeados["valor"] - mediana).abs().groupby(nomeados["lançamento"], observed=True) \
+        .transform("median")
+    escore: pd.Series = 0.6745 * (nomeados["valor"] - mediana) / mad.replace(0, np.nan)
+
+    resultado: pd.DataFrame = nomeados[["lançamento", "período", "acerto", "valor"]].assign(
+        mediana=mediana, escore=escore)
+
+    return resultado[escore.abs().gt(limite)].sort_values(["período", "lançamento"], ascending=[False, True])
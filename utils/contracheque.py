@@ -0,0 +1,213 @@
+import os
+import zlib
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_MIRRORS: list[str] = ["id_lançamento", "período", "acerto", "valor"]
+TIPOS_MIRRORS: dict[str, type] = {"id_lançamento": int, "período": int, "acerto": bool, "valor": float}
+
+LIMITE_COMPACTACAO: int = 500  # linhas do CSV fora do snapshot que disparam um snapshot novo
+
+
+def versao(*caminhos: str) -> tuple[tuple[int, int], ...]:
+    """Data de modificação e tamanho de cada arquivo, para invalidar os caches quando algum mudar."""
+    return tuple((status.st_mtime_ns, status.st_size)
+                 for status in (os.stat(os.path.expanduser(caminho)) for caminho in caminhos))
+
+
+def _conferencia(conteudo: bytes | memoryview) -> int:
+    """CRC de todo o trecho coberto pelo snapshot; uma edição à mão, mesmo sem mudar o tamanho, o invalida."""
+    return zlib.crc32(conteudo)
+
+
+def _snapshot(csv: Path) -> tuple[Path, int, int] | None:
+    snapshots: list[tuple[Path, int, int]] = []
+
+    for parquet in csv.parent.glob(f"{csv.stem}-*-*.parquet"):
+        posicao, crc = parquet.stem.rsplit("-", 2)[1:]
+        snapshots.append((parquet, int(posicao), int(crc, 16)))
+
+    return max(snapshots, key=lambda snapshot: snapshot[1], default=None)
+
+
+def compactar(path_mirrors: str, df: pd.DataFrame | None = None) -> Path:
+    """Grava o snapshot colunar de mirrors.csv e apaga os anteriores."""
+    csv: Path = Path(path_mirrors).expanduser()
+
+    conteudo: bytes = csv.read_bytes()
+    posicao: int = len(conteudo)
+    crc: int = _conferencia(conteudo)
+
+    df = ler_mirrors(path_mirrors, compactar_acima=None) if df is None else df
+    parquet: Path = csv.with_name(f"{csv.stem}-{posicao}-{crc:08x}.parquet")
+    temporario: Path = parquet.with_name(f".{parquet.name}")
+
+    df[COLUNAS_MIRRORS].to_parquet(temporario, index=False)
+    temporario.replace(parquet)
+
+    for antigo in csv.parent.glob(f"{csv.stem}-*-*.parquet"):
+        if antigo != parquet:
+            antigo.unlink(missing_ok=True)
+
+    return parquet
+
+
+def ler_mirrors(path_mirrors: str, compactar_acima: int | None = LIMITE_COMPACTACAO) -> pd.DataFrame:
+    """mirrors.csv a partir do snapshot em Parquet, lendo do CSV só as linhas acrescentadas depois dele."""
+    csv: Path = Path(path_mirrors).expanduser()
+    snapshot: tuple[Path, int, int] | None = _snapshot(csv)
+    df: pd.DataFrame | None = None
+    novas: int = 0
+
+    if snapshot is not None:
+        parquet, posicao, crc = snapshot
+
+        conteudo: memoryview = memoryview(csv.read_bytes())
+
+        if len(conteudo) >= posicao and _conferencia(conteudo[:posicao]) == crc:
+            resto: bytes = conteudo[posicao:].tobytes()
+
+            df = pd.read_parquet(parquet)
+
+            if resto.strip():
+                acrescentadas: pd.DataFrame = pd.read_csv(BytesIO(resto), header=None, names=COLUNAS_MIRRORS,
+                                                          dtype=TIPOS_MIRRORS)
+                df = pd.concat([df, acrescentadas], ignore_index=True)
+                novas = len(acrescentadas)
+
+    if df is None:
+        df = pd.read_csv(csv, dtype=TIPOS_MIRRORS)
+        novas = len(df)
+
+    if compactar_acima is not None and novas > compactar_acima:
+        compactar(path_mirrors, df)
+
+    return df
+
+
+def acrescentar(path_mirrors: str, novos: pd.DataFrame) -> None:
+    """Acrescenta as linhas ao fim de mirrors.csv numa única escrita, sem reescrever o arquivo."""
+    csv: Path = Path(path_mirrors).expanduser()
+    dados: bytes = novos[COLUNAS_MIRRORS].astype(TIPOS_MIRRORS).to_csv(index=False, header=False).encode()
+
+    with open(csv, "rb") as arquivo:
+        if arquivo.seek(0, os.SEEK_END):
+            arquivo.seek(-1, os.SEEK_END)
+
+            if arquivo.read(1) != b"\n":
+                dados = b"\n" + dados
+
+    descritor: int = os.open(csv, os.O_WRONLY | os.O_APPEND)
+
+    try:
+        os.write(descritor, dados)
+        os.fsync(descritor)
+
+    finally:
+        os.close(descritor)
+
+
+def carregar(path_mirrors: str, path_lances: str) -> pd.DataFrame:
+    """Espelhos do contracheque já unidos aos lançamentos, com período, ano e mês inteiros."""
+    lances: pd.DataFrame = pd.read_csv(path_lances, dtype={"id_lançamento": int, "lançamento": "category"})
+
+    df: pd.DataFrame = ler_mirrors(path_mirrors).merge(lances, how="left", on=["id_lançamento"])
+    df["ano"] = df["período"] // 100
+    df["mês"] = df["período"] % 100
+
+    return df[["id_lançamento", "lançamento", "período", "ano", "mês", "acerto", "valor"]]
+
+
+class Cubo:
+    """Valores do contracheque somados em (lançamento, acerto, ano, mês), atualizados a cada inclusão."""
+
+    def __init__(self):
+        self.versao: tuple | None = None
+        self.posicoes: dict[int, int] = {}  # id_lançamento -> posição no cubo
+        self.nomes: dict[int, str] = {}
+        self.primeiro_ano: int = 0
+        self.valores: np.ndarray = np.zeros((0, 2, 0, 12))
+        self.contagem: np.ndarray = np.zeros((0, 2, 0, 12), dtype=np.int32)
+
+    @property
+    def anos(self) -> np.ndarray:
+        return np.arange(self.primeiro_ano, self.primeiro_ano + self.valores.shape[2])
+
+    def _crescer(self, ids: np.ndarray, anos: np.ndarray) -> None:
+        for id_lancamento in pd.unique(ids):
+            self.posicoes.setdefault(int(id_lancamento), len(self.posicoes))
+
+        atuais: int = self.valores.shape[2]
+        inicio: int = min(self.primeiro_ano, int(anos.min())) if atuais else int(anos.min())
+        fim: int = max(self.primeiro_ano + atuais - 1, int(anos.max())) if atuais else int(anos.max())
+        antes: int = self.primeiro_ano - inicio if atuais else 0
+        largura: list[tuple[int, int]] = [(0, len(self.posicoes) - self.valores.shape[0]), (0, 0),
+                                          (antes, fim - inicio + 1 - atuais - antes), (0, 0)]
+
+        self.valores = np.pad(self.valores, largura)
+        self.contagem = np.pad(self.contagem, largura)
+        self.primeiro_ano = inicio
+
+    def acrescentar(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+
+        if "lançamento" in df.columns:
+            self.nomes |= dict(zip(df.loc[df["lançamento"].notna(), "id_lançamento"].astype(int),
+                                   df.loc[df["lançamento"].notna(), "lançamento"].astype(str)))
+
+        anos: np.ndarray = df["período"].to_numpy() // 100
+        self._crescer(df["id_lançamento"].to_numpy(), anos)
+
+        indice: tuple[np.ndarray, ...] = (df["id_lançamento"].map(self.posicoes).to_numpy(),
+                                          df["acerto"].to_numpy(dtype=int),
+                                          anos - self.primeiro_ano,
+                                          df["período"].to_numpy() % 100 - 1)
+
+        np.add.at(self.valores, indice, df["valor"].to_numpy(dtype=float))
+        np.add.at(self.contagem, indice, 1)
+
+    def reconstruir(self, df: pd.DataFrame, versao_arquivos: tuple) -> None:
+        self.__init__()
+        self.acrescentar(df)
+        self.versao = versao_arquivos
+
+    def extrato_anual(self, ano: int, rotulos: list[str]) -> pd.DataFrame:
+        """Lançamentos x meses do ano, com média e total, como a tabela dinâmica do extrato anual."""
+        nomeados: list[int] = [id_lancamento for id_lancamento in self.posicoes if id_lancamento in self.nomes]
+
+        if ano not in self.anos or not nomeados:
+            return pd.DataFrame(columns=["Lançamento", "Acerto", "Média", "Total"])
+
+        posicoes: np.ndarray = np.array([self.posicoes[id_lancamento] for id_lancamento in nomeados])
+        valores: np.ndarray = self.valores[posicoes, :, ano - self.primeiro_ano]
+        contagem: np.ndarray = self.contagem[posicoes, :, ano - self.primeiro_ano]
+
+        meses: np.ndarray = np.flatnonzero(contagem.any(axis=(0, 1)))
+        linhas, acertos = np.nonzero(contagem.any(axis=2))
+
+        load: pd.DataFrame = pd.DataFrame(valores[linhas, acertos][:, meses], columns=[rotulos[mes] for mes in meses])
+        load.insert(0, "Lançamento", [self.nomes[nomeados[linha]] for linha in linhas])
+        load.insert(1, "Acerto", acertos.astype(bool))
+        load["Média"] = load[load.columns[2:]].mean(axis=1)
+        load["Total"] = load[load.columns[2:-1]].sum(axis=1)
+
+        return load.sort_values(["Acerto", "Total"], ascending=[False, False])
+
+    def total_anual(self, rotulos: list[str]) -> pd.DataFrame:
+        """Anos x meses com o total de todos os lançamentos, mais média e total do ano."""
+        valores: np.ndarray = self.valores.sum(axis=(0, 1))
+        contagem: np.ndarray = self.contagem.sum(axis=(0, 1))
+        anos: np.ndarray = np.flatnonzero(contagem.any(axis=1))
+        meses: np.ndarray = np.flatnonzero(contagem.any(axis=0))
+
+        load: pd.DataFrame = pd.DataFrame(valores[np.ix_(anos, meses)], index=self.anos[anos],
+                                          columns=[rotulos[mes] for mes in meses])
+        load.index.name, load.columns.name = "Ano", "Mês"
+        load["Média"] = load.mean(axis=1)
+        load["Total"] = load[load.columns[:-1]].sum(axis=1)
+
+        return load
@@ -0,0 +1,243 @@
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import requests
+
+URL_BASE: str = "https://economia.awesomeapi.com.br"
+
+PARES: list[str] = ["USD-BRL", "EUR-BRL", "GBP-BRL"]
+
+DIR_CAMBIO: Path = Path.home() / ".cache" / "my-pycharm" / "cambio"
+
+TTL: float = 60.0  # segundos em que a cotação vale sem consultar a API de novo
+ESPERA_APOS_FALHA: float = 30.0  # segundos sem nova tentativa depois de uma consulta que falhou
+TIMEOUT: float = 5.0
+ESPERA_SINCRONIZACAO: float = 600.0  # segundos entre sincronizações em segundo plano do mesmo par
+DIAS_POR_CONSULTA: int = 300  # a API corta respostas longas; intervalos maiores vão em várias consultas
+
+Fonte = Callable[[list[str]], dict[str, dict]]
+
+
+class FonteAwesome:
+    """Todos os pares numa única requisição à awesomeapi, com sessão reaproveitada e timeout."""
+
+    def __init__(self, url_base: str = URL_BASE, timeout: float = TIMEOUT):
+        self.url_base: str = url_base
+        self.timeout: float = timeout
+        self.sessao: requests.Session = requests.Session()
+
+    def __call__(self, pares: list[str]) -> dict[str, dict]:
+        resposta: requests.Response = self.sessao.get(f"{self.url_base}/last/{','.join(pares)}", timeout=self.timeout)
+        resposta.raise_for_status()
+
+        return resposta.json()
+
+    def historico(self, par: str, inicio: date, fim: date) -> pd.DataFrame:
+        """Fechamento diário do par entre inicio e fim (colunas data e bid)."""
+        resposta: requests.Response = self.sessao.get(
+            f"{self.url_base}/json/daily/{par}/",
+            params={"start_date": f"{inicio:%Y%m%d}", "end_date": f"{fim:%Y%m%d}"},
+            timeout=self.timeout,
+        )
+        resposta.raise_for_status()
+        registros: list[dict] = resposta.json()
+
+        return pd.DataFrame({
+            "data": pd.to_datetime([int(registro["timestamp"]) for registro in registros], unit="s").normalize(),
+            "bid": [float(registro["bid"]) for registro in registros],
+        })
+
+
+class FonteLocal:
+    """Cotações fixas no formato da awesomeapi, para usar sem rede."""
+
+    NOMES: dict[str, str] = {"USD": "Dólar Americano", "EUR": "Euro", "GBP": "Libra Esterlina"}
+
+    def __init__(self, valores: dict[str, float] | None = None):
+        self.valores: dict[str, float] = valores or {"USD-BRL": 5.0, "EUR-BRL": 5.5, "GBP-BRL": 6.5}
+
+    def __call__(self, pares: list[str]) -> dict[str, dict]:
+        agora: str = f"{datetime.now():%Y-%m-%d %H:%M:%S}"
+
+        return {par.replace("-", ""): {"code": par[:3], "codein": par[4:],
+                                       "name": f"{self.NOMES.get(par[:3], par[:3])}/Real Brasileiro",
+                                       "create_date": agora, "bid": f"{self.valores.get(par, 0.0):.4f}"}
+                for par in pares}
+
+    def historico(self, par: str, inicio: date, fim: date) -> pd.DataFrame:
+        dias: pd.DatetimeIndex = pd.bdate_range(inicio, fim)
+        ordinais: np.ndarray = dias.to_julian_date().to_numpy()
+
+        return pd.DataFrame({"data": dias, "bid": self.valores.get(par, 1.0) * (
+                1 + 0.05 * np.sin(ordinais / 90) + 0.01 * np.sin(ordinais / 7))})
+
+
+class Cotacoes:
+    """Cache das cotações com TTL; vencido, devolve o valor antigo e atualiza numa thread (stale-while-revalidate).
+
+    Só a primeira consulta espera pela rede, e no máximo o timeout da fonte. Se ela falhar, as seguintes tentam de
+    novo em segundo plano, no máximo uma vez a cada `espera` segundos, e devolvem a tabela vazia na hora.
+    """
+
+    def __init__(self, fonte: Fonte | None = None, pares: list[str] | None = None, ttl: float = TTL,
+                 espera: float = ESPERA_APOS_FALHA):
+        self.fonte: Fonte = fonte or FonteAwesome()
+        self.pares: list[str] = pares or PARES
+        self.ttl: float = ttl
+        self.espera: float = espera
+        self.erro: Exception | None = None
+        self._dados: dict[str, dict] = {}
+        self._instante: float = 0.0
+        self._falha: float | None = None
+        self._trava: threading.Lock = threading.Lock()
+        self._atualizacao: threading.Thread | None = None
+
+    def _buscar(self) -> None:
+        try:
+            dados: dict[str, dict] = self.fonte(self.pares)
+
+        except (requests.RequestException, ValueError) as erro:
+            with self._trava:
+                self.erro, self._falha = erro, time.monotonic()
+
+            return
+
+        with self._trava:
+            self._dados, self._instante, self.erro, self._falha = dados, time.monotonic(), None, None
+
+    def _revalidar(self) -> None:
+        with self._trava:
+            if self._atualizacao is None or not self._atualizacao.is_alive():
+                self._atualizacao = threading.Thread(target=self._buscar, daemon=True)
+                self._atualizacao.start()
+
+    def obter(self) -> pd.DataFrame:
+        agora: float = time.monotonic()
+
+        if not self._dados and self._falha is None:
+            self._buscar()
+
+        elif (not self._dados or agora - self._instante > self.ttl) and \
+                (self._falha is None or agora - self._falha > self.espera):
+            self._revalidar()
+
+        return self.tabela()
+
+    def tabela(self) -> pd.DataFrame:
+        with self._trava:
+            cota: pd.DataFrame = pd.DataFrame(list(self._dados.values()), columns=["name", "create_date", "bid"])
+
+        cota["name"] = cota["name"].str.replace("/Real Brasileiro", "")
+        cota["create_date"] = pd.to_datetime(cota["create_date"])
+        cota["bid"] = cota["bid"].astype(float)
+
+        return cota
+
+
+class Historico:
+    """Fechamento diário de cada par em arquivos binários só de acréscimo, um por coluna, lidos com np.memmap.
+
+    Cada sincronização busca só os dias depois do último gravado; o passado nunca é consultado de novo.
+    A página usa atualizar(), que sincroniza numa thread e deixa o gráfico com o que já está gravado.
+    """
+
+    COLUNAS: dict[str, np.dtype] = {"data": np.dtype("datetime64[D]"), "bid": np.dtype(np.float64)}
+
+    def __init__(self, fonte: FonteAwesome | FonteLocal, diretorio: Path = DIR_CAMBIO):
+        self.fonte: FonteAwesome | FonteLocal = fonte
+        self.diretorio: Path = diretorio
+        self._sincronizado: dict[str, date] = {}  # até onde a fonte já foi consultada nesta execução
+        self._trava: threading.Lock = threading.Lock()
+        self.erros: dict[str, Exception] = {}
+        self._tentativas: dict[str, float] = {}
+        self._sincronizacoes: dict[str, threading.Thread] = {}
+        self._trava_sincronizacoes: threading.Lock = threading.Lock()
+
+    def _arquivo(self, par: str, coluna: str) -> Path:
+        return self.diretorio / f"{par}.{coluna}.bin"
+
+    def _linhas(self, par: str) -> int:
+        """Registros completos; uma gravação interrompida deixa colunas de tamanhos diferentes."""
+        return min(self._arquivo(par, coluna).stat().st_size // tipo.itemsize
+                   if self._arquivo(par, coluna).exists() else 0
+                   for coluna, tipo in self.COLUNAS.items())
+
+    def ler(self, par: str) -> dict[str, np.ndarray]:
+        linhas: int = self._linhas(par)
+
+        return {coluna: np.memmap(self._arquivo(par, coluna), dtype=tipo, mode="r", shape=(linhas,))
+                if linhas else np.empty(0, dtype=tipo)
+                for coluna, tipo in self.COLUNAS.items()}
+
+    def _acrescentar(self, par: str, linhas: int, novos: pd.DataFrame) -> None:
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+
+        for coluna, tipo in self.COLUNAS.items():
+            with open(self._arquivo(par, coluna), "ab") as arquivo:
+                arquivo.truncate(linhas * tipo.itemsize)
+                arquivo.write(novos[coluna].to_numpy().astype(tipo).tobytes())
+
+    def sincronizar(self, par: str, inicio: date, fim: date | None = None) -> int:
+        """Acrescenta os dias que faltam até fim (ontem, por padrão: o dia corrente ainda não fechou)."""
+        fim = fim or date.today() - timedelta(days=1)
+
+        with self._trava:
+            linhas: int = self._linhas(par)
+            datas: np.ndarray = self.ler(par)["data"]
+            desde: date = datas[-1].astype(date) + timedelta(days=1) if linhas else inicio
+
+            if par in self._sincronizado:
+                desde = max(desde, self._sincronizado[par] + timedelta(days=1))
+
+            gravados: int = 0
+
+            while desde <= fim:
+                ate: date = min(desde + timedelta(days=DIAS_POR_CONSULTA - 1), fim)
+                novos: pd.DataFrame = self.fonte.historico(par, desde, ate)
+                novos = novos[novos["data"].between(pd.Timestamp(desde), pd.Timestamp(ate))] \
+                    .drop_duplicates(subset=["data"], keep="last") \
+                    .sort_values(by="data")
+
+                self._acrescentar(par, linhas + gravados, novos)
+                self._sincronizado[par] = ate
+                gravados += len(novos)
+                desde = ate + timedelta(days=1)
+
+        return gravados
+
+    def _sincronizar_em_segundo_plano(self, par: str, inicio: date) -> None:
+        try:
+            self.sincronizar(par, inicio)
+            self.erros.pop(par, None)
+
+        except (requests.RequestException, ValueError) as erro:
+            self.erros[par] = erro
+
+    def atualizar(self, par: str, inicio: date, espera: float = ESPERA_SINCRONIZACAO) -> bool:
+        """Sincroniza numa thread se a última tentativa do par tem mais de `espera` s; diz se há uma em andamento."""
+        with self._trava_sincronizacoes:
+            sincronizacao: threading.Thread | None = self._sincronizacoes.get(par)
+
+            if sincronizacao is not None and sincronizacao.is_alive():
+                return True
+
+            if par in self._tentativas and time.monotonic() - self._tentativas[par] < espera:
+                return False
+
+            self._tentativas[par] = time.monotonic()
+            self._sincronizacoes[par] = threading.Thread(target=self._sincronizar_em_segundo_plano, args=(par, inicio),
+                                                         daemon=True)
+            self._sincronizacoes[par].start()
+
+            return True
+
+    def serie(self, par: str, desde: date | None = None) -> pd.DataFrame:
+        colunas: dict[str, np.ndarray] = self.ler(par)
+        inicio: int = 0 if desde is None else int(np.searchsorted(colunas["data"], np.datetime64(desde, "D")))
+
+        return pd.DataFrame({coluna: np.array(valores[inicio:]) for coluna, valores in colunas.items()})
@@ -0,0 +1,94 @@
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+from unidecode import unidecode
+
+PERMUTACOES: int = 64
+FAIXAS: int = 16  # 16 faixas de 4 linhas: pares com Jaccard acima de ~0,5 quase sempre caem no mesmo balde
+LIMIAR: float = 0.8
+
+_SUFIXO: re.Pattern = re.compile(r"[\s\-–:,(]*\b(modulo|mod|parte|volume|vol|unidade|capitulo|cap|turma|nivel)\b"
+                                 r"\.?\s*(\d+|[ivx]+)\)?\s*$")
+
+_rng: np.random.Generator = np.random.default_rng(2024)
+_A: np.ndarray = _rng.integers(1, 2 ** 63, PERMUTACOES, dtype=np.uint64) | np.uint64(1)
+_B: np.ndarray = _rng.integers(0, 2 ** 63, PERMUTACOES, dtype=np.uint64)
+
+
+def normalizar_nome(nome: str) -> str:
+    """Sem acentos, minúsculo, sem pontuação e sem o sufixo de módulo/parte do final."""
+    texto: str = unidecode(str(nome)).lower().strip()
+    anterior: str = ""
+
+    while texto != anterior:
+        anterior, texto = texto, _SUFIXO.sub("", texto).strip()
+
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", texto).split())
+
+
+def shingles(texto: str, n: int = 3) -> set[int]:
+    texto = f" {texto} "
+
+    return {zlib.crc32(texto[x:x + n].encode()) for x in range(max(len(texto) - n + 1, 1))}
+
+
+def assinaturas(conjuntos: list[set[int]]) -> np.ndarray:
+    """MinHash (nomes x PERMUTACOES) com hashing multiplicativo em 64 bits."""
+    tamanhos: np.ndarray = np.array([len(conjunto) for conjunto in conjuntos])
+    valores: np.ndarray = np.fromiter((valor for conjunto in conjuntos for valor in conjunto), dtype=np.uint64,
+                                      count=int(tamanhos.sum()))
+    hashes: np.ndarray = (valores[:, np.newaxis] * _A + _B) >> np.uint64(32)
+
+    return np.minimum.reduceat(hashes, np.r_[0, np.cumsum(tamanhos)[:-1]], axis=0)
+
+
+def candidatos(assinatura: np.ndarray) -> np.ndarray:
+    """Pares de nomes que coincidem em ao menos uma faixa da assinatura (LSH).
+
+    Dentro de cada balde cada nome é ligado ao primeiro e ao anterior, não a todos os outros,
+    para o custo não ficar quadrático quando um balde é grande.
+    """
+    pares: list[np.ndarray] = []
+    linhas: int = PERMUTACOES // FAIXAS
+
+    for faixa in range(FAIXAS):
+        chaves: np.ndarray = np.ascontiguousarray(assinatura[:, faixa * linhas:(faixa + 1) * linhas]) \
+            .view(f"V{8 * linhas}").ravel()
+        _, baldes = np.unique(chaves, return_inverse=True)
+        ordem: np.ndarray = np.argsort(baldes, kind="stable")
+        mesmo_balde: np.ndarray = np.r_[False, baldes[ordem][1:] == baldes[ordem][:-1]]
+        primeiro: np.ndarray = ordem[np.maximum.accumulate(np.where(mesmo_balde, 0, np.arange(len(ordem))))]
+        seguintes: np.ndarray = np.flatnonzero(mesmo_balde)
+
+        pares.append(np.column_stack([primeiro[seguintes], ordem[seguintes]]))
+        pares.append(np.column_stack([ordem[seguintes - 1], ordem[seguintes]]))
+
+    return np.unique(np.vstack(pares), axis=0)
+
+
+def grupos_duplicados(nomes: pd.Series, limiar: float = LIMIAR) -> pd.Series:
+    """Número do grupo de quase-duplicados de cada nome (NaN quando o nome não se repete)."""
+    normalizados: pd.Series = nomes.map(normalizar_nome)
+    unicos: np.ndarray = normalizados.unique()
+    conjuntos: list[set[int]] = [shingles(nome) for nome in unicos]
+
+    pai: list[int] = list(range(len(unicos)))
+
+    def raiz(x: int) -> int:
+        while pai[x] != x:
+            pai[x] = pai[pai[x]]
+            x = pai[x]
+
+        return x
+
+    if len(unicos) > 1:
+        for a, b in candidatos(assinaturas(conjuntos)).tolist():
+            if raiz(a) != raiz(b) and len(conjuntos[a] & conjuntos[b]) / len(conjuntos[a] | conjuntos[b]) >= limiar:
+                pai[raiz(a)] = raiz(b)
+
+    grupo: pd.Series = normalizados.map(dict(zip(unicos, (raiz(x) for x in range(len(unicos))))))
+    repetidos: pd.Series = grupo.duplicated(keep=False)
+
+    return grupo.where(repetidos).rank(method="dense")
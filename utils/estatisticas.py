@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.megasena import DIR_CACHE, TOTAL_BOLAS, registrar_indice
+
+ARQ_ESTATISTICAS: Path = DIR_CACHE / "estatisticas.npz"
+
+_BITS: np.ndarray = np.arange(TOTAL_BOLAS, dtype=np.uint64)
+
+
+def matriz_bolas(mascaras: np.ndarray) -> np.ndarray:
+    """Matriz booleana (sorteios x 60) com as bolas de cada sorteio."""
+    return ((mascaras[:, np.newaxis] >> _BITS) & np.uint64(1)).astype(bool)
+
+
+class Estatisticas:
+    def __init__(self, ultimo: int = 0, sorteios: int = 0, frequencia: np.ndarray | None = None,
+                 ultima_aparicao: np.ndarray | None = None, coocorrencia: np.ndarray | None = None):
+        self.ultimo = ultimo  # último concurso incorporado
+        self.sorteios = sorteios
+        self.frequencia = np.zeros(TOTAL_BOLAS, dtype=np.int64) if frequencia is None else frequencia
+        self.ultima_aparicao = np.full(TOTAL_BOLAS, -1, dtype=np.int64) \
+            if ultima_aparicao is None else ultima_aparicao
+        self.coocorrencia = np.zeros((TOTAL_BOLAS, TOTAL_BOLAS), dtype=np.int64) \
+            if coocorrencia is None else coocorrencia
+
+    @property
+    def atraso(self) -> np.ndarray:
+        """Quantos sorteios se passaram desde a última vez que cada bola saiu."""
+        return self.sorteios - 1 - self.ultima_aparicao
+
+    def acrescentar(self, novos: pd.DataFrame) -> None:
+        if novos.empty:
+            return
+
+        if novos["id_sorteio"].iat[0] != self.ultimo + 1:
+            raise ValueError(f"As estatísticas vão até o concurso {self.ultimo}, "
+                             f"não dá para acrescentar a partir do {novos.id_sorteio.iat[0]}")
+
+        matriz: np.ndarray = matriz_bolas(novos["mascara"].to_numpy())
+        contagem: np.ndarray = matriz.astype(np.int64)
+        saiu: np.ndarray = matriz.any(axis=0)
+
+        self.frequencia += contagem.sum(axis=0)
+        self.coocorrencia += contagem.T @ contagem
+        self.ultima_aparicao[saiu] = self.sorteios + len(matriz) - 1 - np.argmax(matriz[::-1], axis=0)[saiu]
+        self.sorteios += len(matriz)
+        self.ultimo = int(novos["id_sorteio"].iat[-1])
+
+    def tabela(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "bola": np.arange(1, TOTAL_BOLAS + 1),
+            "frequencia": self.frequencia,
+            "percentual": self.frequencia / max(self.sorteios, 1),
+            "atraso": self.atraso,
+        })
+
+    def pares(self, quantidade: int = 20) -> pd.DataFrame:
+        linhas, colunas = np.triu_indices(TOTAL_BOLAS, k=1)
+        ordem: np.ndarray = np.argsort(self.coocorrencia[linhas, colunas], kind="stable")[::-1][:quantidade]
+
+        return pd.DataFrame({
+            "par": [f"{a + 1:02d} - {b + 1:02d}" for a, b in zip(linhas[ordem], colunas[ordem])],
+            "vezes": self.coocorrencia[linhas[ordem], colunas[ordem]],
+        })
+
+    def salvar(self) -> None:
+        DIR_CACHE.mkdir(parents=True, exist_ok=True)
+        np.savez(ARQ_ESTATISTICAS, controle=np.array([self.ultimo, self.sorteios]), frequencia=self.frequencia,
+                 ultima_aparicao=self.ultima_aparicao, coocorrencia=self.coocorrencia)
+
+    @classmethod
+    def ler(cls) -> "Estatisticas":
+        if not ARQ_ESTATISTICAS.exists():
+            return cls()
+
+        with np.load(ARQ_ESTATISTICAS) as arquivo:
+            ultimo, sorteios = arquivo["controle"].tolist()
+
+            return cls(ultimo, sorteios, arquivo["frequencia"], arquivo["ultima_aparicao"], arquivo["coocorrencia"])
+
+
+def atualizar(historico: pd.DataFrame) -> Estatisticas:
+    """Estatísticas em dia com o histórico, incorporando só os concursos que ainda faltam."""
+    estatisticas: Estatisticas = Estatisticas.ler()
+
+    if estatisticas.ultimo > historico["id_sorteio"].iat[-1] or \
+            estatisticas.sorteios != historico["id_sorteio"].le(estatisticas.ultimo).sum():
+        estatisticas = Estatisticas()
+
+    novos: pd.DataFrame = historico[historico["id_sorteio"].gt(estatisticas.ultimo)]
+
+    if not novos.empty:
+        estatisticas.acrescentar(novos)
+        estatisticas.salvar()
+
+    return estatisticas
+
+
+@registrar_indice
+def _ao_acrescentar(novos: pd.DataFrame) -> None:
+    estatisticas: Estatisticas = Estatisticas.ler()
+
+    # histórico refeito desde o começo (planilha corrigida): as estatísticas recomeçam junto
+    if novos["id_sorteio"].iat[0] <= estatisticas.ultimo:
+        estatisticas = Estatisticas()
+
+    # fora de sequência: a próxima chamada de atualizar() refaz tudo a partir do histórico
+    if novos["id_sorteio"].iat[0] == estatisticas.ultimo + 1:
+        estatisticas.acrescentar(novos)
+        estatisticas.salvar()
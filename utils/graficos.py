@@ -0,0 +1,48 @@
+import json
+import threading
+from collections.abc import Callable, Hashable, Iterable
+
+import plotly.graph_objects as go
+
+
+class CacheFiguras:
+    """Figuras do Plotly já serializadas, por chave (versão dos dados, ano, tema...)."""
+
+    def __init__(self):
+        self._figuras: dict[Hashable, dict] = {}
+        self._aquecidas: set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def obter(self, chave: Hashable, construir: Callable[[], go.Figure]) -> dict:
+        with self._lock:
+            figura: dict | None = self._figuras.get(chave)
+
+        if figura is None:
+            figura = json.loads(construir().to_json())
+
+            with self._lock:
+                self._figuras[chave] = figura
+
+        return figura
+
+    def descartar(self, manter: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            self._figuras = {chave: figura for chave, figura in self._figuras.items() if manter(chave)}
+
+    def preaquecer(self, grupo: Hashable, chaves: Iterable[Hashable],
+                   construir: Callable[[Hashable], go.Figure]) -> threading.Thread | None:
+        """Monta em segundo plano as figuras que ainda não estão no cache; cada grupo é aquecido uma vez só."""
+        with self._lock:
+            if grupo in self._aquecidas:
+                return None
+
+            self._aquecidas.add(grupo)
+
+        def aquecer() -> None:
+            for chave in chaves:
+                self.obter(chave, lambda: construir(chave))
+
+        thread: threading.Thread = threading.Thread(target=aquecer, name="preaquecer-figuras", daemon=True)
+        thread.start()
+
+        return thread
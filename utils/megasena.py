@@ -0,0 +1,347 @@
+import hashlib
+import json
+import math
+import re
+from collections.abc import Callable, Iterable
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TOTAL_BOLAS: int = 60
+
+DIR_CACHE: Path = Path("~/.cache/my-pycharm/megasena").expanduser()
+DIR_HISTORICO: Path = DIR_CACHE / "historico"
+ARQ_INDICE: Path = DIR_CACHE / "indice.json"
+MAX_PARTES: int = 64
+
+COLUNAS_BOLAS: list[str] = [f"bola_{x}" for x in range(1, 7)]
+COLUNAS_PREMIOS: list[str] = ["acerto_6", "rateio_6", "acerto_5", "rateio_5", "acerto_4", "rateio_4"]
+ROTULOS_BOLAS: np.ndarray = np.array([f"{x:02d}" for x in range(TOTAL_BOLAS + 1)])
+
+MIN_BOLAS_APOSTA: int = 6
+MAX_BOLAS_APOSTA: int = 15
+
+# PREMIOS[k, h] = quantas senas, quinas e quadras paga uma aposta de k números que acertou h bolas
+PREMIOS: np.ndarray = np.array([[[math.comb(h, faixa) * math.comb(k - h, 6 - faixa) if h <= k else 0
+                                  for faixa in (6, 5, 4)] for h in range(7)] for k in range(MAX_BOLAS_APOSTA + 1)],
+                                dtype=np.int64)
+
+# sorteios que vieram errados/ausentes na planilha da Caixa
+CORRECOES: dict[int, dict[str, object]] = {
+    2701: {"dt_sorteio": "16/03/2024", "bolas": (6, 15, 18, 31, 32, 47), "acerto_6": 0, "rateio_6": 0.0,
+           "acerto_5": 72, "rateio_5": 59349.01, "acerto_4": 5712, "rateio_4": 1068.7},
+}
+
+
+def popcount(mascaras: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(mascaras).astype(np.uint8)
+
+    # numpy < 2.0: contagem de bits por SWAR
+    x: np.ndarray = mascaras.astype(np.uint64)
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+
+    return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.uint8)
+
+
+def aposta_to_mask(aposta: str | Iterable[int]) -> int:
+    bolas: Iterable[int] = map(int, aposta.split()) if isinstance(aposta, str) else aposta
+    mascara: int = 0
+
+    for bola in bolas:
+        if not 1 <= bola <= TOTAL_BOLAS:
+            raise ValueError(f"Bola {bola} fora do intervalo 1-{TOTAL_BOLAS}")
+
+        mascara |= 1 << (bola - 1)
+
+    return mascara
+
+
+def apostas_to_masks(apostas: Iterable[str | Iterable[int]]) -> np.ndarray:
+    return np.fromiter((aposta_to_mask(aposta) for aposta in apostas), dtype=np.uint64)
+
+
+def mask_to_bolas(mascara: int) -> str:
+    mascara = int(mascara)
+
+    return " ".join(f"{bola + 1:02d}" for bola in range(TOTAL_BOLAS) if mascara >> bola & 1)
+
+
+def matriz_to_masks(matriz: np.ndarray) -> np.ndarray:
+    matriz = matriz.astype(np.uint64)
+
+    return np.bitwise_or.reduce(np.uint64(1) << (matriz - np.uint64(1)), axis=1)
+
+
+def score_apostas(sorteios: np.ndarray, apostas: np.ndarray) -> np.ndarray:
+    """Matriz (sorteios x apostas) com a quantidade de bolas acertadas."""
+    return popcount(sorteios[:, np.newaxis] & apostas[np.newaxis, :])
+
+
+def ler_apostas(texto: str) -> list[str]:
+    """Uma aposta por linha, com 6 a 15 números separados por espaço, vírgula, ponto e vírgula ou hífen."""
+    apostas: list[str] = []
+
+    for n, linha in enumerate(texto.splitlines(), start=1):
+        bolas: list[int] = sorted({int(bola) for bola in re.findall(r"\d+", linha)})
+
+        if not bolas:
+            continue
+
+        if not MIN_BOLAS_APOSTA <= len(bolas) <= MAX_BOLAS_APOSTA or not 1 <= bolas[0] <= bolas[-1] <= TOTAL_BOLAS:
+            raise ValueError(f"Linha {n}: a aposta deve ter de {MIN_BOLAS_APOSTA} a {MAX_BOLAS_APOSTA} "
+                             f"números distintos entre 1 e {TOTAL_BOLAS}")
+
+        apostas.append(" ".join(f"{bola:02d}" for bola in bolas))
+
+    return apostas
+
+
+def conferir_lote(historico: pd.DataFrame, apostas: list[str], lote: int = 1024) -> pd.DataFrame:
+    """Confere todas as apostas contra todos os sorteios: ocorrências de 6, 5 e 4 acertos e o rateio ganho."""
+    mascaras: np.ndarray = apostas_to_masks(apostas)
+    sorteios: np.ndarray = historico["mascara"].to_numpy()
+    rateios: np.ndarray = historico[["rateio_6", "rateio_5", "rateio_4"]].to_numpy(dtype=float)
+    qtd_bolas: np.ndarray = popcount(mascaras)
+
+    ocorrencias: np.ndarray = np.zeros((len(apostas), 3), dtype=np.int64)
+    premio: np.ndarray = np.zeros(len(apostas), dtype=float)
+
+    for inicio in range(0, len(apostas), lote):
+        fatia: slice = slice(inicio, inicio + lote)
+        acertos: np.ndarray = score_apostas(sorteios, mascaras[fatia])
+
+        ocorrencias[fatia] = np.stack([(acertos == r).sum(axis=0) for r in (6, 5, 4)], axis=1)
+        premio[fatia] = np.einsum("dbf,df->b", PREMIOS[qtd_bolas[fatia], acertos], rateios)
+
+    return pd.DataFrame({
+        "aposta": apostas,
+        "qtd_bolas": qtd_bolas,
+        "acerto_6": ocorrencias[:, 0],
+        "acerto_5": ocorrencias[:, 1],
+        "acerto_4": ocorrencias[:, 2],
+        "premio": premio,
+    })
+
+
+def chave_planilha(planilha: bytes) -> str:
+    return hashlib.sha256(planilha).hexdigest()
+
+
+def normalizar(bruto: pd.DataFrame, desde: int = 0) -> pd.DataFrame:
+    df: pd.DataFrame = pd.DataFrame({
+        "id_sorteio": bruto["Concurso"].astype(int),
+        "dt_sorteio": bruto["Data do Sorteio"].astype(str),
+    })
+
+    for coluna, bola in zip(COLUNAS_BOLAS, bruto.columns[2:8]):
+        df[coluna] = bruto[bola].astype(np.uint8)
+
+    for acerto in [6, 5, 4]:
+        df[f"acerto_{acerto}"] = bruto[f"Ganhadores {acerto} acertos"].astype(int)
+        df[f"rateio_{acerto}"] = bruto[f"Rateio {acerto} acertos"].astype(str) \
+                                     .str.replace(r"\D", "", regex=True).astype(float) / 100
+
+    df.set_index(["id_sorteio"], inplace=True)
+
+    for id_sorteio, correcao in CORRECOES.items():
+        if desde < id_sorteio <= df.index.max():
+            df.loc[id_sorteio, COLUNAS_BOLAS] = correcao["bolas"]
+            df.loc[id_sorteio, ["dt_sorteio"] + COLUNAS_PREMIOS] = \
+                [correcao["dt_sorteio"]] + [correcao[coluna] for coluna in COLUNAS_PREMIOS]
+
+    df["dt_sorteio"] = pd.to_datetime(df["dt_sorteio"], format="%d/%m/%Y")
+    df = df.reset_index().sort_values(by=["id_sorteio", "dt_sorteio"], ignore_index=True)
+    df = df.astype({coluna: np.uint8 for coluna in COLUNAS_BOLAS} | {"acerto_6": int, "acerto_5": int, "acerto_4": int})
+
+    df["mascara"] = matriz_to_masks(df[COLUNAS_BOLAS].to_numpy())
+
+    return df
+
+
+def exibicao(historico: pd.DataFrame) -> pd.DataFrame:
+    df: pd.DataFrame = historico[["id_sorteio", "dt_sorteio"]].copy()
+    df["bolas"] = [" ".join(linha) for linha in ROTULOS_BOLAS[historico[COLUNAS_BOLAS].to_numpy()]]
+    df[COLUNAS_PREMIOS + ["mascara"]] = historico[COLUNAS_PREMIOS + ["mascara"]]
+
+    return df
+
+
+# funções chamadas com os sorteios recém-gravados, para manter os índices derivados em dia
+_indices: list[Callable[[pd.DataFrame], None]] = []
+
+
+def registrar_indice(atualizar: Callable[[pd.DataFrame], None]) -> Callable[[pd.DataFrame], None]:
+    _indices.append(atualizar)
+    return atualizar
+
+
+def indice_virada(historico: pd.DataFrame) -> pd.Series:
+    """Ano -> concurso da Mega-Sena da Virada, o último sorteio de cada ano."""
+    return historico["id_sorteio"].groupby(historico["dt_sorteio"].dt.year.rename("ano")).max()
+
+
+def indice_mensal(historico: pd.DataFrame) -> dict[tuple[int, int], slice]:
+    """(ano, mês) -> fatia de linhas do histórico; os sorteios estão em ordem de data."""
+    chaves: np.ndarray = (historico["dt_sorteio"].dt.year * 100 + historico["dt_sorteio"].dt.month).to_numpy()
+    inicios: np.ndarray = np.flatnonzero(np.r_[True, chaves[1:] != chaves[:-1]])
+    fins: np.ndarray = np.r_[inicios[1:], len(chaves)]
+
+    return {(int(chaves[inicio]) // 100, int(chaves[inicio]) % 100): slice(int(inicio), int(fim))
+            for inicio, fim in zip(inicios, fins)}
+
+
+def _ler_indice() -> dict:
+    return json.loads(ARQ_INDICE.read_text()) if ARQ_INDICE.exists() else {"linhas": 0}
+
+
+def _gravar_indice(indice: dict) -> None:
+    ARQ_INDICE.write_text(json.dumps(indice))
+
+
+def ler_historico() -> pd.DataFrame | None:
+    if not any(DIR_HISTORICO.glob("parte-*.parquet")):
+        return None
+
+    historico: pd.DataFrame = pd.read_parquet(DIR_HISTORICO)
+
+    if not historico["id_sorteio"].is_monotonic_increasing:
+        historico = historico.sort_values(by=["id_sorteio"], ignore_index=True)
+
+    return historico
+
+
+def ultimo_concurso() -> int:
+    partes: list[Path] = sorted(DIR_HISTORICO.glob("parte-*.parquet"))
+
+    return int(partes[-1].stem.split("-")[-1]) if partes else 0
+
+
+def _gravar_parte(df: pd.DataFrame) -> Path:
+    primeiro, ultimo = df["id_sorteio"].iat[0], df["id_sorteio"].iat[-1]
+    parte: Path = DIR_HISTORICO / f"parte-{primeiro:05d}-{ultimo:05d}.parquet"
+    temporario: Path = parte.with_name(f".{parte.name}")  # arquivos com "." são ignorados na leitura
+
+    DIR_HISTORICO.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(temporario, index=False)
+    temporario.replace(parte)
+
+    return parte
+
+
+def _compactar() -> None:
+    partes: list[Path] = sorted(DIR_HISTORICO.glob("parte-*.parquet"))
+
+    if len(partes) > MAX_PARTES:
+        compactada: Path = _gravar_parte(ler_historico())
+
+        for parte in partes:
+            if parte != compactada:
+                parte.unlink(missing_ok=True)
+
+
+def validar(novos: pd.DataFrame, ultimo: int, dt_ultimo: pd.Timestamp | None = None) -> None:
+    ids: np.ndarray = novos["id_sorteio"].to_numpy()
+
+    if ids[0] != ultimo + 1 or (np.diff(ids) != 1).any():
+        raise ValueError(f"Os concursos devem seguir o {ultimo} sem lacunas: {ids[0]}...{ids[-1]}")
+
+    bolas: np.ndarray = novos[COLUNAS_BOLAS].to_numpy().astype(int)
+
+    if ((bolas < 1) | (bolas > TOTAL_BOLAS)).any():
+        raise ValueError(f"Há bolas fora do intervalo 1-{TOTAL_BOLAS}")
+
+    if (popcount(matriz_to_masks(bolas)) != len(COLUNAS_BOLAS)).any():
+        raise ValueError("Há sorteios com bolas repetidas")
+
+    datas: pd.Series = novos["dt_sorteio"]
+
+    if not datas.is_monotonic_increasing or (dt_ultimo is not None and datas.iat[0] < dt_ultimo):
+        raise ValueError("As datas dos sorteios devem ser crescentes")
+
+    if (novos[COLUNAS_PREMIOS] < 0).any(axis=None):
+        raise ValueError("Ganhadores e rateios não podem ser negativos")
+
+
+def acrescentar(novos: pd.DataFrame, historico: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Grava só os sorteios posteriores ao último concurso salvo e devolve as linhas acrescentadas."""
+    ultimo: int = ultimo_concurso()
+    novos = novos[novos["id_sorteio"].gt(ultimo)].sort_values(by=["id_sorteio"], ignore_index=True)
+
+    if novos.empty:
+        return novos
+
+    if "mascara" not in novos.columns:
+        novos = novos.assign(mascara=matriz_to_masks(novos[COLUNAS_BOLAS].to_numpy()))
+
+    if historico is None and ultimo:
+        historico = ler_historico()
+
+    validar(novos, ultimo, None if historico is None else historico["dt_sorteio"].iat[-1])
+
+    novos = novos.astype({coluna: np.uint8 for coluna in COLUNAS_BOLAS})
+    _gravar_parte(novos)
+    _compactar()
+
+    for atualizar in _indices:
+        atualizar(novos)
+
+    return novos
+
+
+def _resumo_linhas(bruto: pd.DataFrame) -> np.ndarray:
+    """Hash de cada linha da planilha, só nas colunas que a normalização usa."""
+    colunas: list[str] = list(bruto.columns[:8]) + [f"{campo} {acerto} acertos" for acerto in [6, 5, 4]
+                                                    for campo in ["Ganhadores", "Rateio"]]
+
+    return pd.util.hash_pandas_object(bruto[colunas], index=False).to_numpy()
+
+
+def _resumo(hashes: np.ndarray) -> str:
+    return hashlib.sha256(hashes.tobytes()).hexdigest()
+
+
+def _apagar_historico() -> None:
+    for parte in DIR_HISTORICO.glob("parte-*.parquet"):
+        parte.unlink(missing_ok=True)
+
+
+def carregar(planilha: bytes, chave: str | None = None) -> pd.DataFrame:
+    """Lê a planilha da Mega-Sena usando o cache em Parquet; só as linhas novas passam pela normalização.
+
+    As linhas já gravadas são conferidas pelo hash: se alguma mudou, ou se a planilha é mais curta que o histórico,
+    o histórico é refeito a partir dela. O openpyxl lê a aba inteira de qualquer forma; a economia está na
+    normalização e na gravação.
+    """
+    chave = chave or chave_planilha(planilha)
+    indice: dict = _ler_indice()
+    historico: pd.DataFrame | None = ler_historico()
+
+    if historico is not None and indice.get("chave") == chave:
+        return exibicao(historico)
+
+    bruto: pd.DataFrame = pd.read_excel(BytesIO(planilha), engine="openpyxl")
+
+    if bruto.empty:
+        raise ValueError("A planilha da Mega-Sena está vazia")
+
+    hashes: np.ndarray = _resumo_linhas(bruto)
+    linhas: int = indice.get("linhas", 0)
+
+    if historico is None or len(bruto) < linhas or _resumo(hashes[:linhas]) != indice.get("resumo"):
+        # linha corrigida, planilha mais antiga ou outro arquivo: o histórico gravado não é prefixo desta planilha
+        _apagar_historico()
+        historico, linhas = None, 0
+
+    if len(bruto) > linhas:
+        ultimo: int = 0 if historico is None else int(historico["id_sorteio"].iat[-1])
+        novos: pd.DataFrame = acrescentar(normalizar(bruto.iloc[linhas:], desde=ultimo), historico)
+        historico = novos if historico is None else pd.concat([historico, novos], ignore_index=True)
+
+    _gravar_indice({"chave": chave, "linhas": len(bruto), "resumo": _resumo(hashes)})
+
+    return exibicao(historico)
@@ -0,0 +1,108 @@
+import locale
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import streamlit as st
+
+INICIO: float = time.perf_counter()  # primeira importação deste módulo, logo no início do processo
+
+
+def toggle_sidebar() -> None:
+    if st.session_state["toggle_sidebar"] == "expanded":
+        st.session_state["toggle_sidebar"] = "collapsed"
+    else:
+        st.session_state["toggle_sidebar"] = "expanded"
+
+
+@st.cache_resource(show_spinner=False)
+def estilos(caminho: str = "styles/styles.css") -> str:
+    return Path(caminho).read_text()
+
+
+@st.cache_resource(show_spinner=False)
+def configurar_locale() -> None:
+    """O locale vale para o processo inteiro, então basta definir uma vez e não a cada rerun."""
+    locale.setlocale(locale.LC_ALL, "pt_BR.UTF-8")
+
+
+@st.cache_resource(show_spinner=False)
+def tempos() -> dict:
+    return {"primeira_tela": None, "paginas": {}}
+
+
+@contextmanager
+def medir(pagina: str) -> Iterator[None]:
+    """Registra quanto a página levou para rodar; execuções interrompidas (st.rerun, st.switch_page) não contam."""
+    inicio: float = time.perf_counter()
+
+    yield
+
+    fim: float = time.perf_counter()
+    registro: dict = tempos()
+    pagina_atual: dict = registro["paginas"].setdefault(pagina, {"primeira": fim - inicio, "seguintes": 0.0,
+                                                                 "execuções": 0})
+    pagina_atual["execuções"] += 1
+    pagina_atual["última"] = fim - inicio
+
+    if pagina_atual["execuções"] > 1:
+        pagina_atual["seguintes"] += fim - inicio
+
+    if registro["primeira_tela"] is None:
+        registro["primeira_tela"] = fim - INICIO
+
+
+def relatorio() -> list[dict]:
+    """Primeira execução de cada página (importações e cargas a frio) contra a média das seguintes, em ms."""
+    return [{"página": pagina,
+             "primeira": valores["primeira"] * 1000,
+             "média das seguintes": valores["seguintes"] / (valores["execuções"] - 1) * 1000
+             if valores["execuções"] > 1 else None,
+             "última": valores["última"] * 1000,
+             "execuções": valores["execuções"]}
+            for pagina, valores in tempos()["paginas"].items()]
+
+
+def home() -> None:
+    with st.sidebar:
+        st.header(":material/home: Menu")
+
+        st.markdown("")
+
+        for numero, pagina in enumerate(list(paginas().values())[1:], start=1):
+            if st.button(f"**{pagina.title}**", key=f"btn{numero}", type="tertiary", icon=pagina.icon,
+                         use_container_width=True, on_click=toggle_sidebar):
+                st.switch_page(pagina)
+
+        with st.expander("Tempos de carga", icon=":material/timer:"):
+            if tempos()["primeira_tela"] is not None:
+                st.caption(f"Primeira tela em {tempos()['primeira_tela'] * 1000:.0f} ms desde o início do processo.")
+
+            st.dataframe(
+                data=relatorio(),
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "página": st.column_config.TextColumn("Página"),
+                    "primeira": st.column_config.NumberColumn("Primeira (ms)", format="%.0f"),
+                    "média das seguintes": st.column_config.NumberColumn("Seguintes (ms)", format="%.0f"),
+                    "última": st.column_config.NumberColumn("Última (ms)", format="%.0f"),
+                    "execuções": st.column_config.NumberColumn("Execuções"),
+                },
+            )
+
+    st.title(":material/logo_dev: Meus Apps")
+
+
+def paginas() -> dict[str, st.Page]:
+    """As páginas do app num lugar só, para o st.navigation, o menu e os botões "Voltar".
+
+    A página inicial é uma função, sem caminho de arquivo: o st.switch_page só a encontra pelo objeto Page.
+    """
+    return {
+        "home": st.Page(home, title="Meus Apps", icon="🇧🇷", default=True),
+        "contracheque": st.Page("pages/contracheque.py", title="Contracheque", icon=":material/payments:"),
+        "megasena": st.Page("pages/megasena.py", title="Mega-Sena", icon=":material/nest_thermostat_e_eu:"),
+        "unibb": st.Page("pages/unibb.py", title="Cursos da UniBB", icon=":material/auto_stories:"),
+    }
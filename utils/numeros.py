@@ -0,0 +1,191 @@
+import math
+import random
+import time
+from functools import cache, lru_cache
+from typing import Iterator
+
+import numpy as np
+
+LIMITE_CRIVO: int = 1 << 20  # abaixo disso a primalidade é consulta direta ao crivo
+
+BASES_MILLER_RABIN: tuple[int, ...] = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+LIMITE_DETERMINISTICO: int = 3_317_044_064_679_887_385_961_981  # ψ13: abaixo dele as 13 bases bastam
+RODADAS_ALEATORIAS: int = 16  # bases sorteadas a mais acima do limite; erro menor que 4^-16
+
+LIMITE_DIGITOS: int = 4000  # resultados maiores são mostrados em notação científica (str de int para em 4300)
+
+LIMITE_RHO: int = 1 << 20  # iterações de Pollard-rho por tentativa antes de trocar a constante c
+TEMPO_FATORACAO: float = 2.0  # segundos para a fatoração inteira; o que faltar decompor volta como resto
+LIMITE_DIGITOS_PRIMO: int = 300  # acima disso cada rodada do Miller-Rabin já passa de 10 ms
+
+
+@cache
+def crivo(limite: int = LIMITE_CRIVO) -> np.ndarray:
+    """Crivo de Eratóstenes: crivo()[n] diz se n é primo."""
+    primo: np.ndarray = np.ones(limite, dtype=bool)
+    primo[:2] = False
+
+    for n in range(2, math.isqrt(limite - 1) + 1):
+        if primo[n]:
+            primo[n * n::n] = False
+
+    return primo
+
+
+@cache
+def primos_pequenos(limite: int = 1000) -> tuple[int, ...]:
+    return tuple(np.flatnonzero(crivo()[:limite]).tolist())
+
+
+def eh_primo(n: int) -> bool:
+    """Crivo para n pequeno; acima, Miller-Rabin com bases fixas (exato até 3,3e24) e, além disso, bases sorteadas."""
+    if n < LIMITE_CRIVO:
+        return n >= 2 and bool(crivo()[n])
+
+    if any(n % primo == 0 for primo in primos_pequenos()):
+        return False
+
+    d, s = n - 1, 0
+
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+
+    sorteadas: list[int] = [random.randrange(2, n - 1) for _ in range(RODADAS_ALEATORIAS)] \
+        if n >= LIMITE_DETERMINISTICO else []
+
+    for base in [*BASES_MILLER_RABIN, *sorteadas]:
+        x: int = pow(base, d, n)
+
+        if x in (1, n - 1):
+            continue
+
+        for _ in range(s - 1):
+            x = x * x % n
+
+            if x == n - 1:
+                break
+
+        else:
+            return False
+
+    return True
+
+
+def _brent(n: int, c: int, prazo: float) -> int | None:
+    """Um fator não trivial de n pelo Pollard-rho na variante de Brent, ou None se não achar até o prazo."""
+    y, r, q, g = 2, 1, 1, 1
+    x = ys = y
+    bloco: int = 128
+
+    while g == 1:
+        x = y
+
+        for _ in range(r):
+            y = (y * y + c) % n
+
+        k: int = 0
+
+        while k < r and g == 1:
+            ys = y
+
+            for _ in range(min(bloco, r - k)):
+                y = (y * y + c) % n
+                q = q * abs(x - y) % n
+
+            g = math.gcd(q, n)
+            k += bloco
+
+        r *= 2
+
+        if r > LIMITE_RHO or time.monotonic() > prazo:
+            return None
+
+    if g == n:
+        g = 1
+
+        while g == 1:
+            ys = (ys * ys + c) % n
+            g = math.gcd(abs(x - ys), n)
+
+    return g if g != n else None
+
+
+def fatorar(n: int, tempo: float = TEMPO_FATORACAO) -> tuple[dict[int, int], int]:
+    """Fatores primos de n com seus expoentes e o que sobrou sem decompor em `tempo` segundos (1 se completa)."""
+    prazo: float = time.monotonic() + tempo
+    fatores: dict[int, int] = {}
+    resto: int = 1
+
+    for primo in primos_pequenos():
+        while n % primo == 0:
+            fatores[primo] = fatores.get(primo, 0) + 1
+            n //= primo
+
+    pendentes: list[int] = [n] if n > 1 else []
+
+    while pendentes:
+        m: int = pendentes.pop()
+
+        if eh_primo(m):
+            fatores[m] = fatores.get(m, 0) + 1
+            continue
+
+        raiz: int = math.isqrt(m)
+
+        if raiz * raiz == m:
+            pendentes += [raiz, raiz]
+            continue
+
+        fator: int | None = next((f for c in range(1, 4) if time.monotonic() <= prazo and (f := _brent(m, c, prazo))),
+                                 None)
+
+        if fator is None:
+            resto *= m
+
+        else:
+            pendentes += [fator, m // fator]
+
+    return dict(sorted(fatores.items())), resto
+
+
+def quantidade_divisores(fatores: dict[int, int]) -> int:
+    return math.prod(expoente + 1 for expoente in fatores.values())
+
+
+@lru_cache(maxsize=64)
+def fatorial(n: int) -> int:
+    return math.factorial(n)
+
+
+def fibonacci(n: int) -> int:
+    """n-ésimo termo por duplicação rápida: F(2k) = F(k)(2F(k+1) - F(k)) e F(2k+1) = F(k)² + F(k+1)²."""
+    a, b = 0, 1
+
+    for bit in bin(n)[2:]:
+        c, d = a * (2 * b - a), a * a + b * b
+        a, b = (d, c + d) if bit == "1" else (c, d)
+
+    return a
+
+
+def serie_fibonacci() -> Iterator[int]:
+    a, b = 0, 1
+
+    while True:
+        yield a
+        a, b = b, a + b
+
+
+def log10_fatorial(n: int) -> float:
+    return math.lgamma(n + 1) / math.log(10)
+
+
+def log10_fibonacci(n: int) -> float:
+    """Pela fórmula de Binet; vale a partir de n = 1."""
+    return n * math.log10((1 + math.sqrt(5)) / 2) - math.log10(5) / 2
+
+
+def notacao_cientifica(log10: float, casas: int = 6) -> str:
+    expoente: int = math.floor(log10)
+
+    return f"{10 ** (log10 - expoente):.{casas}f} × 10<sup>{expoente}</sup>"
@@ -0,0 +1,151 @@
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Iterator
+
+import streamlit as st
+
+MAX_EXECUCOES: int = 100  # reruns guardados por sessão para o painel e a exportação
+
+# só a thread do script mede; threads de pré-aquecimento e afins passam direto
+_local: threading.local = threading.local()
+
+
+@contextmanager
+def secao(nome: str, tipo: str = "seção") -> Iterator[None]:
+    """Tempo de parede e memória líquida (com tracemalloc ligado) do bloco, dentro da execução corrente."""
+    atual: dict | None = getattr(_local, "execucao", None)
+
+    if atual is None:
+        yield
+        return
+
+    memoria: int | None = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+    inicio: float = time.perf_counter()
+    _local.nivel += 1
+
+    try:
+        yield
+
+    finally:
+        _local.nivel -= 1
+        atual["medidas"].append({
+            "nome": nome,
+            "tipo": tipo,
+            "nível": _local.nivel,
+            "início_ms": (inicio - _local.inicio) * 1000,
+            "ms": (time.perf_counter() - inicio) * 1000,
+            "memória_kb": (tracemalloc.get_traced_memory()[0] - memoria) / 1024 if memoria is not None else None,
+        })
+
+
+class _Perfilada:
+    """Função medida a cada chamada; o resto (como o .clear() dos caches do Streamlit) vai para a original."""
+
+    def __init__(self, funcao: Callable):
+        self._funcao: Callable = funcao
+        self.__name__: str = getattr(funcao, "__name__", repr(funcao))
+
+    def __call__(self, *args, **kwargs) -> Any:
+        with secao(self.__name__, "função"):
+            return self._funcao(*args, **kwargs)
+
+    def __getattr__(self, nome: str) -> Any:
+        return getattr(self._funcao, nome)
+
+
+def perfilar(funcao: Callable) -> Callable:
+    """Por fora do @st.cache_data, para medir tanto os acertos quanto as faltas do cache."""
+    return _Perfilada(funcao)
+
+
+@contextmanager
+def execucao(pagina: str) -> Iterator[None]:
+    """Abre a medição de um rerun; ao final (mesmo interrompido por st.rerun) guarda no histórico da sessão."""
+    _local.execucao = {"página": pagina, "instante": f"{datetime.now():%Y-%m-%d %H:%M:%S}", "medidas": []}
+    _local.nivel, _local.inicio = 0, time.perf_counter()
+
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+
+    try:
+        yield
+
+    finally:
+        atual: dict = _local.execucao
+        _local.execucao = None
+
+        atual["ms"] = (time.perf_counter() - _local.inicio) * 1000
+        atual["pico_kb"] = tracemalloc.get_traced_memory()[1] / 1024 if tracemalloc.is_tracing() else None
+
+        historico: list[dict] = st.session_state.setdefault("perfil", [])
+        historico.append(atual)
+        del historico[:-MAX_EXECUCOES]
+
+
+def _alternar_memoria() -> None:
+    if st.session_state["perfil_memoria"] and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    elif not st.session_state["perfil_memoria"] and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def painel() -> None:
+    """Painel recolhível na sidebar com o último rerun, o acumulado da sessão e a exportação em JSON."""
+    historico: list[dict] = st.session_state.get("perfil", [])
+
+    with st.sidebar.expander("Perfil do rerun", icon=":material/speed:"):
+        st.toggle("Medir memória (tracemalloc)", value=tracemalloc.is_tracing(), key="perfil_memoria",
+                  on_change=_alternar_memoria)
+
+        if not historico:
+            st.caption("Nenhum rerun medido ainda.")
+            return
+
+        ultima: dict = historico[-1]
+        st.caption(f"{ultima['página']} em {ultima['ms']:.0f} ms"
+                   + (f", pico de {ultima['pico_kb'] / 1024:.1f} MB" if ultima["pico_kb"] is not None else ""))
+
+        colunas: dict = {
+            "nome": st.column_config.TextColumn("Bloco"),
+            "tipo": st.column_config.TextColumn("Tipo"),
+            "ms": st.column_config.NumberColumn("ms", format="%.1f"),
+            "memória_kb": st.column_config.NumberColumn("KB", format="%.0f"),
+            "chamadas": st.column_config.NumberColumn("Chamadas"),
+            "máximo": st.column_config.NumberColumn("Máx. ms", format="%.1f"),
+        }
+
+        st.dataframe(
+            data=[medida | {"nome": "· " * medida["nível"] + medida["nome"]}
+                  for medida in sorted(ultima["medidas"], key=lambda medida: medida["início_ms"])],
+            hide_index=True,
+            use_container_width=True,
+            column_order=["nome", "tipo", "ms", "memória_kb"],
+            column_config=colunas,
+        )
+
+        acumulado: dict[str, dict] = {}
+
+        for medida in (medida for execucao_anterior in historico for medida in execucao_anterior["medidas"]):
+            bloco: dict = acumulado.setdefault(medida["nome"], {"nome": medida["nome"], "tipo": medida["tipo"],
+                                                                "chamadas": 0, "ms": 0.0, "máximo": 0.0})
+            bloco["chamadas"] += 1
+            bloco["ms"] += medida["ms"]
+            bloco["máximo"] = max(bloco["máximo"], medida["ms"])
+
+        st.caption(f"Acumulado dos últimos {len(historico)} reruns")
+        st.dataframe(
+            data=sorted(acumulado.values(), key=lambda bloco: bloco["ms"], reverse=True),
+            hide_index=True,
+            use_container_width=True,
+            column_order=["nome", "chamadas", "ms", "máximo"],
+            column_config=colunas,
+        )
+
+        st.download_button("**Exportar JSON**", data=json.dumps(historico, ensure_ascii=False, indent=2),
+                           file_name=f"perfil-{datetime.now():%Y%m%d-%H%M%S}.json", mime="application/json",
+                           icon=":material/download:", use_container_width=True)
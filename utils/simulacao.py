@@ -0,0 +1,103 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.megasena import PREMIOS, TOTAL_BOLAS, matriz_to_masks, popcount, score_apostas
+
+PRECO_APOSTA: float = 6.0  # aposta simples de 6 números
+TOTAL_COMBINACOES: int = math.comb(TOTAL_BOLAS, 6)
+
+
+def custo(qtd_bolas: np.ndarray) -> float:
+    return float(sum(math.comb(int(k), 6) for k in qtd_bolas) * PRECO_APOSTA)
+
+
+def sortear(rng: np.random.Generator, quantidade: int) -> np.ndarray:
+    """Máscaras de `quantidade` sorteios de 6 bolas entre 60, sem reposição."""
+    mascaras: np.ndarray = np.empty(quantidade, dtype=np.uint64)
+    pendentes: np.ndarray = np.arange(quantidade)
+
+    # sorteia 6 bolas com reposição e refaz só os sorteios que repetiram bola (~22% a cada rodada)
+    while pendentes.size:
+        bolas: np.ndarray = rng.integers(1, TOTAL_BOLAS + 1, size=(pendentes.size, 6), dtype=np.uint64)
+        mascaras[pendentes] = matriz_to_masks(bolas)
+        pendentes = pendentes[popcount(mascaras[pendentes]) != 6]
+
+    return mascaras
+
+
+class Resultado:
+    def __init__(self, apostas: np.ndarray, sorteios: int = 0, distribuicao: np.ndarray | None = None,
+                 melhor: np.ndarray | None = None, premio: float = 0.0):
+        self.apostas = apostas
+        self.sorteios = sorteios
+        self.distribuicao = np.zeros((len(apostas), 7), dtype=np.int64) if distribuicao is None else distribuicao
+        self.melhor = np.zeros(7, dtype=np.int64) if melhor is None else melhor  # maior acerto da carteira
+        self.premio = premio
+
+    def __add__(self, outro: "Resultado") -> "Resultado":
+        return Resultado(self.apostas, self.sorteios + outro.sorteios, self.distribuicao + outro.distribuicao,
+                         self.melhor + outro.melhor, self.premio + outro.premio)
+
+    @property
+    def custo(self) -> float:
+        return custo(popcount(self.apostas))
+
+    @property
+    def retorno_esperado(self) -> float:
+        """Prêmio médio por concurso menos o custo da carteira."""
+        return self.premio / max(self.sorteios, 1) - self.custo
+
+
+def _simular_lote(apostas: np.ndarray, rateios: np.ndarray, quantidade: int, semente: np.random.SeedSequence,
+                  lote: int) -> Resultado:
+    rng: np.random.Generator = np.random.default_rng(semente)
+    qtd_bolas: np.ndarray = popcount(apostas)
+    valores: np.ndarray = PREMIOS[qtd_bolas] @ rateios  # (apostas x acertos) prêmio de cada aposta
+    deslocamento: np.ndarray = np.arange(len(apostas)) * 7
+    resultado: Resultado = Resultado(apostas)
+
+    for inicio in range(0, quantidade, lote):
+        acertos: np.ndarray = score_apostas(sortear(rng, min(lote, quantidade - inicio)), apostas)
+        distribuicao: np.ndarray = np.bincount((acertos + deslocamento).ravel(),
+                                               minlength=7 * len(apostas)).reshape(-1, 7)
+
+        resultado += Resultado(apostas, len(acertos), distribuicao, np.bincount(acertos.max(axis=1), minlength=7),
+                               float((distribuicao * valores).sum()))
+
+    return resultado
+
+
+def simular(apostas: np.ndarray, rateios: np.ndarray, sorteios: int = 10_000_000, processos: int | None = None,
+            semente: int | None = None, lote: int = 250_000) -> Resultado:
+    """Monte Carlo da carteira de apostas; `rateios` é o valor pago por sena, quina e quadra."""
+    processos = processos or os.cpu_count() or 1
+    rateios = np.asarray(rateios, dtype=float)
+    partes: list[int] = [sorteios // processos + (x < sorteios % processos) for x in range(processos)]
+    sementes: list[np.random.SeedSequence] = np.random.SeedSequence(semente).spawn(processos)
+
+    if processos == 1:
+        return _simular_lote(apostas, rateios, sorteios, sementes[0], lote)
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        resultados = executor.map(_simular_lote, [apostas] * processos, [rateios] * processos, partes, sementes,
+                                  [lote] * processos)
+
+        return sum(resultados, Resultado(apostas))
+
+
+def distribuicao_exata(qtd_bolas: int) -> np.ndarray:
+    """Probabilidade exata (hipergeométrica) de uma aposta de `qtd_bolas` números acertar 0 a 6 bolas."""
+    return np.array([math.comb(qtd_bolas, h) * math.comb(TOTAL_BOLAS - qtd_bolas, 6 - h) / TOTAL_COMBINACOES
+                     for h in range(7)])
+
+
+def retorno_esperado_exato(apostas: np.ndarray, rateios: np.ndarray) -> float:
+    """Pela linearidade da esperança, o prêmio esperado da carteira é a soma do de cada aposta."""
+    qtd_bolas: np.ndarray = popcount(apostas)
+    premio: float = sum(float(distribuicao_exata(int(k)) @ PREMIOS[k] @ np.asarray(rateios, dtype=float))
+                        for k in qtd_bolas)
+
+    return premio - custo(qtd_bolas)
@@ -0,0 +1,267 @@
+import asyncio
+import socket
+import ssl
+import threading
+import time
+from urllib.parse import urljoin, urlsplit
+
+import numpy as np
+
+TIMEOUT: float = 5.0  # segundos por site, somando DNS, conexão, TLS e resposta
+TTL: float = 30.0  # segundos em que o status de um site vale sem nova consulta
+MAX_SIMULTANEOS: int = 256
+MAX_OCIOSA: float = 15.0  # segundos que uma conexão fica no pool esperando reuso
+MAX_REDIRECIONAMENTOS: int = 5
+REDIRECIONAMENTOS: frozenset[int] = frozenset({301, 302, 303, 307, 308})
+
+Conexao = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+def _endereco(site: str) -> tuple[str, str, int, str]:
+    """Esquema, host, porta e caminho; sem esquema vale https, como no checador antigo."""
+    partes = urlsplit(site if "://" in site else f"https://{site}")
+
+    return partes.scheme, partes.hostname or "", partes.port or (443 if partes.scheme == "https" else 80), \
+        (partes.path or "/") + (f"?{partes.query}" if partes.query else "")
+
+
+def _ms(inicio: float) -> float:
+    return (time.perf_counter() - inicio) * 1000
+
+
+class Verificador:
+    """Checa vários sites ao mesmo tempo num event loop próprio, com HEAD primeiro e GET se o HEAD for recusado.
+
+    O loop roda numa thread e sobrevive aos reruns do Streamlit, então as conexões keep-alive do pool são
+    reaproveitadas entre consultas; quem chama nunca espera mais que o timeout.
+    """
+
+    def __init__(self, timeout: float = TIMEOUT, ttl: float = TTL):
+        self.timeout: float = timeout
+        self.ttl: float = ttl
+        self._cache: dict[str, tuple[float, dict]] = {}
+        self._pool: dict[tuple[str, str, int], list[tuple[float, Conexao]]] = {}
+        self._contexto: ssl.SSLContext = ssl.create_default_context()
+        self._loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._limite: asyncio.Semaphore = asyncio.Semaphore(MAX_SIMULTANEOS)
+
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+
+    async def _conectar(self, esquema: str, host: str, porta: int, tempos: dict) -> Conexao:
+        inicio: float = time.perf_counter()
+        enderecos: list = await self._loop.getaddrinfo(host, porta, type=socket.SOCK_STREAM)
+        tempos["dns"] = _ms(inicio)
+
+        inicio = time.perf_counter()
+        reader, writer = await asyncio.open_connection(enderecos[0][4][0], porta)
+        tempos["conexão"] = _ms(inicio)
+
+        if esquema == "https":
+            inicio = time.perf_counter()
+
+            try:
+                await writer.start_tls(self._contexto, server_hostname=host)
+
+            except BaseException:
+                writer.close()
+                raise
+
+            tempos["tls"] = _ms(inicio)
+
+        return reader, writer
+
+    def _do_pool(self, chave: tuple[str, str, int]) -> Conexao | None:
+        while self._pool.get(chave):
+            instante, (reader, writer) = self._pool[chave].pop()
+
+            if time.monotonic() - instante < MAX_OCIOSA and not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+
+            writer.close()
+
+        return None
+
+    @staticmethod
+    async def _requisitar(conexao: Conexao, metodo: str, host: str, caminho: str, manter: bool) -> tuple[int, dict]:
+        reader, writer = conexao
+        writer.write(f"{metodo} {caminho} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: my-pycharm\r\nAccept: */*\r\n"
+                     f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n".encode())
+        await writer.drain()
+
+        linha: bytes = await reader.readline()
+
+        if not linha:
+            raise ConnectionResetError("conexão encerrada pelo servidor")
+
+        status: int = int(linha.split()[1])
+        cabecalhos: dict[str, str] = {}
+
+        while (linha := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            nome, _, valor = linha.decode("latin-1").partition(":")
+            cabecalhos[nome.strip().lower()] = valor.strip()
+
+        return status, cabecalhos
+
+    async def _consultar(self, url: str, tempos: dict, resultado: dict) -> tuple[int, dict]:
+        """HEAD em url (GET se o HEAD for recusado); a conexão volta ao pool ou é fechada, mesmo com erro."""
+        esquema, host, porta, caminho = _endereco(url)
+        chave: tuple[str, str, int] = (esquema, host, porta)
+        conexao: Conexao | None = self._do_pool(chave)
+        resultado["reutilizada"] = conexao is not None
+
+        try:
+            try:
+                conexao = conexao or await self._conectar(esquema, host, porta, tempos)
+                espera: float = time.perf_counter()
+                status, cabecalhos = await self._requisitar(conexao, "HEAD", host, caminho, True)
+
+            except ConnectionResetError:
+                if not resultado["reutilizada"]:
+                    raise
+
+                # a conexão do pool tinha expirado do lado do servidor
+                conexao[1].close()
+                resultado["reutilizada"] = False
+                conexao = await self._conectar(esquema, host, porta, tempos)
+                espera = time.perf_counter()
+                status, cabecalhos = await self._requisitar(conexao, "HEAD", host, caminho, True)
+
+            if status in (405, 501):
+                conexao[1].close()
+                resultado["reutilizada"] = False
+                conexao = await self._conectar(esquema, host, porta, tempos)
+                espera = time.perf_counter()
+                status, cabecalhos = await self._requisitar(conexao, "GET", host, caminho, False)
+                cabecalhos["connection"] = "close"
+
+            resultado["resposta"] = _ms(espera)
+
+        except BaseException:
+            # inclui o CancelledError do asyncio.timeout: sem isso o socket ficaria aberto no loop
+            if conexao is not None:
+                conexao[1].close()
+
+            raise
+
+        if cabecalhos.get("connection", "").lower() == "close":
+            conexao[1].close()
+
+        else:
+            self._pool.setdefault(chave, []).append((time.monotonic(), conexao))
+
+        return status, cabecalhos
+
+    async def _checar(self, site: str) -> dict:
+        url: str = site if "://" in site else f"https://{site}"
+        tempos: dict = {"dns": None, "conexão": None, "tls": None}
+        resultado: dict = {"site": site, "status": None, "reutilizada": False, "destino": None}
+        inicio: float = time.perf_counter()
+
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with self._limite:
+                    # segue os redirecionamentos como o requests.get do checador antigo, até um limite
+                    for _ in range(MAX_REDIRECIONAMENTOS + 1):
+                        status, cabecalhos = await self._consultar(url, tempos, resultado)
+
+                        if status not in REDIRECIONAMENTOS or "location" not in cabecalhos:
+                            break
+
+                        url = urljoin(url, cabecalhos["location"])
+                        resultado["destino"] = url
+
+            resultado |= {"status": status, "erro": None}
+
+        except TimeoutError:
+            resultado |= {"resposta": None, "erro": "tempo esgotado"}
+
+        except (OSError, ValueError, IndexError) as erro:
+            resultado |= {"resposta": None, "erro": str(erro) or type(erro).__name__}
+
+        return resultado | tempos | {"total": _ms(inicio)}
+
+    async def _checar_todos(self, sites: list[str]) -> list[dict]:
+        return await asyncio.gather(*(self._checar(site) for site in sites))
+
+    def verificar(self, sites: list[str]) -> list[dict]:
+        """Status e tempos (em ms) de cada site; repete o resultado guardado enquanto o TTL não vence."""
+        agora: float = time.monotonic()
+        pendentes: list[str] = list(dict.fromkeys(site for site in sites
+                                                  if agora - self._cache.get(site, (-self.ttl, {}))[0] >= self.ttl))
+
+        if pendentes:
+            futuro = asyncio.run_coroutine_threadsafe(self._checar_todos(pendentes), self._loop)
+            resultados: list[dict] = futuro.result(timeout=self.timeout + 1)
+
+            for resultado in resultados:
+                self._cache[resultado["site"]] = (time.monotonic(), resultado)
+
+        return [self._cache[site][1] for site in sites]
+
+
+def percentis(resultados: list[dict], quantis: tuple[int, ...] = (50, 90, 99)) -> dict[str, float]:
+    """Percentis do tempo total das consultas que tiveram resposta."""
+    totais: list[float] = [resultado["total"] for resultado in resultados if resultado["status"] is not None]
+
+    if not totais:
+        return {}
+
+    return dict(zip((f"p{quantil}" for quantil in quantis), np.percentile(totais, quantis).tolist()))
+
+
+if __name__ == "__main__":
+    # conferência contra um servidor HTTP local: python -m utils.sites
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Stub(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _responder(self, status: int, cabecalhos: dict[str, str] | None = None) -> None:
+            self.send_response(status)
+
+            for nome, valor in (cabecalhos or {}).items():
+                self.send_header(nome, valor)
+
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_HEAD(self) -> None:
+            match self.path:
+                case "/sem-head":
+                    self._responder(405)
+                case "/lento":
+                    time.sleep(2)
+                    self._responder(200)
+                case "/redireciona":
+                    self._responder(301, {"Location": "/ok"})
+                case _:
+                    self._responder(200)
+
+        def do_GET(self) -> None:
+            self._responder(200)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    servidor: ThreadingHTTPServer = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    base: str = f"http://127.0.0.1:{servidor.server_port}"
+
+    with socket.socket() as livre:
+        livre.bind(("127.0.0.1", 0))
+        recusada: str = f"http://127.0.0.1:{livre.getsockname()[1]}/"
+
+    verificador: Verificador = Verificador(timeout=1.0, ttl=0.0)
+    ok, sem_head, lento, redireciona, fechado = verificador.verificar(
+        [f"{base}/ok", f"{base}/sem-head", f"{base}/lento", f"{base}/redireciona", recusada])
+
+    assert ok["status"] == 200 and not ok["reutilizada"], ok
+    assert sem_head["status"] == 200, sem_head
+    assert lento["status"] is None and lento["erro"] == "tempo esgotado", lento
+    assert redireciona["status"] == 200 and redireciona["destino"] == f"{base}/ok", redireciona
+    assert fechado["status"] is None and fechado["erro"], fechado
+    assert verificador.verificar([f"{base}/ok"])[0]["reutilizada"], "a conexão keep-alive não voltou ao pool"
+    assert all(not writer.is_closing() for conexoes in verificador._pool.values() for _, (_, writer) in conexoes)
+
+    print("ok:", ", ".join(f"{resultado['site']} {resultado['status']}"
+                           for resultado in (ok, sem_head, lento, redireciona, fechado)))
@@ -0,0 +1,169 @@
+import re
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Callable
+
+import pandas as pd
+from unidecode import unidecode
+
+MORSE: dict[str, str] = {
+    "A": ".-", "B": "-...", "C": "-.-.", "D": "-..", "E": ".", "F": "..-.", "G": "--.",
+    "H": "....", "I": "..", "J": ".---", "K": "-.-", "L": ".-..", "M": "--", "N": "-.",
+    "O": "---", "P": ".--.", "Q": "--.-", "R": ".-.", "S": "...", "T": "-", "U": "..-",
+    "V": "...-", "W": ".--", "X": "-..-", "Y": "-.--", "Z": "--..", "1": ".----",
+    "2": "..---", "3": "...--", "4": "....-", "5": ".....", "6": "-....", "7": "--...",
+    "8": "---..", "9": "----.", "0": "-----", ",": "--..--", ".": ".-.-.-", "?": "..--..",
+    "/": "-..-.", "-": "-....-", "(": "-.--.", ")": "-.--.-", "!": "-.-.--", "'": ".----.",
+    ":": "---...",
+}
+
+# cada caractere vira o código seguido de um espaço, com acentos e minúsculas já resolvidos na tabela;
+# o espaço entre palavras vira dois espaços, o que dá três entre os códigos, como o code_morse antigo
+_PARA_MORSE: dict[int, str] = str.maketrans(
+    {caractere: " ".join(MORSE[letra] for letra in unidecode(caractere).upper()) + " "
+     for caractere in map(chr, range(0x20, 0x250))
+     if unidecode(caractere).strip() and all(letra in MORSE for letra in unidecode(caractere).upper())}
+    | {" ": "  "}
+)
+
+LIMITE_ROMANO: int = 9999  # o mesmo teto do widget antigo; cada milhar acima de 3999 é só mais um "M"
+
+_DE_MORSE: dict[str, str] = {codigo: letra for letra, codigo in MORSE.items()}
+
+_UNIDADES_ROMANAS: list[list[str]] = [
+    ["", "C", "CC", "CCC", "CD", "D", "DC", "DCC", "DCCC", "CM"],
+    ["", "X", "XX", "XXX", "XL", "L", "LX", "LXX", "LXXX", "XC"],
+    ["", "I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX"],
+]
+
+_ROMANOS: list[str] = [c + d + u for c in _UNIDADES_ROMANAS[0] for d in _UNIDADES_ROMANAS[1]
+                       for u in _UNIDADES_ROMANAS[2]]  # 0 a 999; os milhares são prefixos "M"
+
+_ARABICOS: dict[str, int] = {romano: numero for numero, romano in enumerate(_ROMANOS)}
+
+_UNIDADES: list[str] = ["zero", "um", "dois", "três", "quatro", "cinco", "seis", "sete", "oito", "nove", "dez",
+                        "onze", "doze", "treze", "quatorze", "quinze", "dezesseis", "dezessete", "dezoito",
+                        "dezenove"]
+_DEZENAS: list[str] = ["", "", "vinte", "trinta", "quarenta", "cinquenta", "sessenta", "setenta", "oitenta",
+                       "noventa"]
+_CENTENAS: list[str] = ["", "cento", "duzentos", "trezentos", "quatrocentos", "quinhentos", "seiscentos",
+                        "setecentos", "oitocentos", "novecentos"]
+_ESCALAS: list[tuple[str, str]] = [("", ""), ("mil", "mil"), ("milhão", "milhões"), ("bilhão", "bilhões"),
+                                   ("trilhão", "trilhões")]
+
+
+def _ate_999(n: int) -> str:
+    if n == 100:
+        return "cem"
+
+    partes: list[str] = [_CENTENAS[n // 100]] if n >= 100 else []
+    resto: int = n % 100
+
+    if resto >= 20:
+        partes += [_DEZENAS[resto // 10]] + ([_UNIDADES[resto % 10]] if resto % 10 else [])
+
+    elif resto:
+        partes.append(_UNIDADES[resto])
+
+    return " e ".join(partes)
+
+
+_EXTENSOS: list[str] = [_ate_999(n) for n in range(1000)]  # 0 sai vazio: só aparece dentro de números maiores
+
+
+def para_morse(texto: str) -> str:
+    return texto.translate(_PARA_MORSE).rstrip()
+
+
+def de_morse(codigo: str) -> str:
+    """Palavras separadas por três espaços (ou "/") e letras por um espaço; códigos desconhecidos viram "?"."""
+    return " ".join("".join(_DE_MORSE.get(letra, "?") for letra in palavra.split())
+                    for palavra in re.split(r" {3,}|\s*/\s*", codigo.strip()))
+
+
+def romano(n: int) -> str:
+    """De 1 a 3999 pela tabela; acima disso, até LIMITE_ROMANO, um "M" a mais para cada milhar."""
+    if n < 1:
+        raise ValueError("Não existe número romano para zero ou negativos.")
+
+    if n > LIMITE_ROMANO:
+        raise ValueError(f"Digite um número de até {LIMITE_ROMANO}.")
+
+    return "M" * (n // 1000) + _ROMANOS[n % 1000]
+
+
+def arabico(texto: str) -> int:
+    texto = texto.strip().upper()
+    milhares: int = len(texto) - len(texto.lstrip("M"))
+
+    if texto[milhares:] not in _ARABICOS or not texto:
+        raise ValueError(f"{texto!r} não é um número romano válido.")
+
+    if 1000 * milhares > LIMITE_ROMANO:
+        raise ValueError(f"Digite um romano de até {romano(LIMITE_ROMANO)}.")
+
+    return 1000 * milhares + _ARABICOS[texto[milhares:]]
+
+
+def extenso(n: int) -> str:
+    """Número inteiro por extenso, até a casa dos trilhões."""
+    if n < 0:
+        return f"menos {extenso(-n)}"
+
+    if n == 0:
+        return "zero"
+
+    if n >= 1000 ** len(_ESCALAS):
+        raise ValueError("Número grande demais para escrever por extenso.")
+
+    grupos: list[tuple[int, int]] = [(escala, n // 1000 ** escala % 1000)
+                                     for escala in reversed(range(len(_ESCALAS))) if n // 1000 ** escala % 1000]
+    partes: list[str] = []
+
+    for escala, valor in grupos:
+        singular, plural = _ESCALAS[escala]
+        nome: str = _EXTENSOS[valor]
+
+        if escala == 1:
+            partes.append("mil" if valor == 1 else f"{nome} mil")
+
+        else:
+            partes.append(f"{nome} {singular if valor == 1 else plural}".strip())
+
+    # "mil e cem" e "um milhão e duzentos mil", mas "mil duzentos e trinta" e "um milhão, duzentos e trinta mil"
+    texto: str = partes[0]
+
+    for (escala_anterior, _), (escala, valor), parte in zip(grupos, grupos[1:], partes[1:]):
+        if escala == grupos[-1][0] and (valor < 100 or valor % 100 == 0):
+            texto += f" e {parte}"
+
+        else:
+            texto += f"{',' if escala_anterior > 1 else ''} {parte}"
+
+    return texto
+
+
+def extenso_reais(valor: float | Decimal | str) -> str:
+    """Valor em reais por extenso, como se escreve num cheque: "um milhão de reais e cinco centavos"."""
+    centavos_total: int = int(Decimal(str(valor)).scaleb(2).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+    if centavos_total < 0:
+        return f"menos {extenso_reais(Decimal(-centavos_total).scaleb(-2))}"
+
+    reais, centavos = divmod(centavos_total, 100)
+    partes: list[str] = []
+
+    if reais or not centavos:
+        moeda: str = "real" if reais == 1 else "de reais" if reais >= 1_000_000 and reais % 1_000_000 == 0 else "reais"
+        partes.append(f"{extenso(reais)} {moeda}")
+
+    if centavos:
+        partes.append(f"{extenso(centavos)} {'centavo' if centavos == 1 else 'centavos'}")
+
+    return " e ".join(partes)
+
+
+def em_lote(coluna: pd.Series, conversao: Callable) -> pd.Series:
+    """Aplica a conversão a uma coluna inteira, calculando cada valor distinto uma vez só."""
+    unicos: pd.Series = coluna.dropna().drop_duplicates()
+
+    return coluna.map(dict(zip(unicos, map(conversao, unicos))))
@@ -0,0 +1,166 @@
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+COLUNAS: list[str] = ["id_curso", "nm_curso", "dt_curso", "cg_curso", "mod_curso", "lzc_curso", "cnh_curso",
+                      "area_cnh_curso"]
+
+CATEGORICAS: list[str] = ["mod_curso", "lzc_curso", "cnh_curso", "area_cnh_curso"]
+
+DIMENSOES: list[str] = ["ano", "area_cnh_curso", "cnh_curso", "lzc_curso"]
+
+LIMITE_JOURNAL: int = 500  # operações no journal que disparam a compactação do CSV
+
+
+def journal(file_csv: str) -> Path:
+    return Path(file_csv).expanduser().with_suffix(".journal.jsonl")
+
+
+def versao(file_csv: str) -> tuple[tuple[int, int], ...]:
+    """Tamanho e data de modificação do CSV e do journal; muda a cada gravação."""
+    return tuple((status.st_size, status.st_mtime_ns) if status else (0, 0)
+                 for status in (caminho.stat() if caminho.exists() else None
+                                for caminho in (Path(file_csv).expanduser(), journal(file_csv))))
+
+
+def _linha(valores: dict) -> dict:
+    linha: dict = {coluna: valores.get(coluna) for coluna in COLUNAS}
+    linha["id_curso"] = int(linha["id_curso"])
+    linha["cg_curso"] = int(linha["cg_curso"])
+    linha["dt_curso"] = pd.Timestamp(linha["dt_curso"]).date().isoformat()
+
+    return linha
+
+
+def operacoes(base: pd.DataFrame, delta: dict) -> list[dict]:
+    """Converte o delta do st.data_editor (por posição na tabela) em operações por id_curso."""
+    ops: list[dict] = [{"op": "apagar", "id_curso": int(base["id_curso"].iat[posicao])}
+                       for posicao in delta.get("deleted_rows", [])]
+
+    for posicao, mudancas in delta.get("edited_rows", {}).items():
+        anterior: dict = base.iloc[int(posicao)].to_dict()
+        linha: dict = _linha(anterior | mudancas)
+
+        if linha["id_curso"] != int(anterior["id_curso"]):
+            ops.append({"op": "apagar", "id_curso": int(anterior["id_curso"])})
+
+        ops.append({"op": "gravar"} | linha)
+
+    ops.extend({"op": "gravar"} | _linha(linha) for linha in delta.get("added_rows", []))
+
+    return ops
+
+
+def aplicar(df: pd.DataFrame, ops: list[dict]) -> pd.DataFrame:
+    """Aplica as operações mantendo a ordem das linhas; vale a última operação de cada id_curso."""
+    if not ops:
+        return df
+
+    ultimas: pd.DataFrame = pd.DataFrame(ops).drop_duplicates(subset=["id_curso"], keep="last").set_index("id_curso")
+    apagados: pd.Index = ultimas.index[ultimas["op"].eq("apagar")]
+    gravados: pd.DataFrame = ultimas[ultimas["op"].eq("gravar")].reindex(columns=COLUNAS[1:])
+    gravados["dt_curso"] = pd.to_datetime(gravados["dt_curso"])
+
+    df = df.set_index("id_curso").drop(index=apagados, errors="ignore")
+    existentes: pd.Index = gravados.index.intersection(df.index)
+
+    for coluna in CATEGORICAS:
+        if isinstance(df[coluna].dtype, pd.CategoricalDtype):
+            df[coluna] = df[coluna].cat.add_categories(
+                pd.Index(gravados[coluna].dropna().unique()).difference(df[coluna].cat.categories))
+
+    df.loc[existentes, COLUNAS[1:]] = gravados.loc[existentes]
+    df = pd.concat([df, gravados.drop(index=existentes)])
+    df = df.astype({"cg_curso": int} | {coluna: "category" for coluna in CATEGORICAS})
+
+    return df.reset_index(names="id_curso")[COLUNAS]
+
+
+def _ler_journal(file_csv: str) -> list[dict]:
+    caminho: Path = journal(file_csv)
+
+    if not caminho.exists():
+        return []
+
+    return [json.loads(linha) for linha in caminho.read_text().splitlines() if linha.strip()]
+
+
+def ler(file_csv: str) -> pd.DataFrame:
+    """unibb.csv com as operações do journal já aplicadas."""
+    df: pd.DataFrame = pd.read_csv(file_csv, parse_dates=["dt_curso"],
+                                   dtype={coluna: "category" for coluna in CATEGORICAS})
+
+    return aplicar(df, _ler_journal(file_csv))
+
+
+def para_editor(df: pd.DataFrame) -> pd.DataFrame:
+    """Cópia com as categóricas em texto comum: o st.data_editor não aceita valor novo numa coluna Categorical."""
+    return df.astype({coluna: object for coluna in CATEGORICAS})
+
+
+def compactar(file_csv: str, df: pd.DataFrame | None = None) -> None:
+    """Regrava o CSV com o journal aplicado e zera o journal."""
+    csv: Path = Path(file_csv).expanduser()
+    temporario: Path = csv.with_name(f".{csv.name}")
+
+    (ler(file_csv) if df is None else df).to_csv(temporario, index=False)
+    temporario.replace(csv)
+    journal(file_csv).unlink(missing_ok=True)
+
+
+def registrar(file_csv: str, ops: list[dict]) -> None:
+    """Acrescenta as operações ao journal numa única escrita; compacta quando o journal cresce demais."""
+    dados: bytes = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops).encode()
+    descritor: int = os.open(journal(file_csv), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    try:
+        os.write(descritor, dados)
+        os.fsync(descritor)
+
+    finally:
+        os.close(descritor)
+
+    with open(journal(file_csv), "rb") as arquivo:
+        if sum(1 for _ in arquivo) > LIMITE_JOURNAL:
+            compactar(file_csv)
+
+
+class Cubo:
+    """Horas (cg_curso) e quantidade de cursos somadas por ano, área, conhecimento e estudo."""
+
+    def __init__(self):
+        self.versao: tuple | None = None
+        self.celulas: pd.DataFrame = self._somar(pd.DataFrame(columns=COLUNAS))
+
+    @staticmethod
+    def _somar(df: pd.DataFrame) -> pd.DataFrame:
+        return df.assign(ano=pd.to_datetime(df["dt_curso"]).dt.year,
+                         **{coluna: df[coluna].astype(str) for coluna in DIMENSOES[1:]}) \
+            .groupby(DIMENSOES)["cg_curso"] \
+            .agg(horas="sum", cursos="size") \
+            .astype(int)
+
+    def _combinar(self, parcial: pd.DataFrame, sinal: int) -> None:
+        celulas: pd.DataFrame = self.celulas.add(parcial * sinal, fill_value=0)
+        self.celulas = celulas[celulas["cursos"].ne(0)].astype(int)
+
+    def reconstruir(self, df: pd.DataFrame, versao_arquivos: tuple) -> None:
+        self.celulas = self._somar(df)
+        self.versao = versao_arquivos
+
+    def atualizar(self, anterior: pd.DataFrame, atual: pd.DataFrame, ops: list[dict]) -> None:
+        """Tira as linhas antigas dos cursos afetados pelas operações e soma as novas."""
+        ids: list[int] = list({op["id_curso"] for op in ops})
+
+        self._combinar(self._somar(anterior[anterior["id_curso"].isin(ids)]), -1)
+        self._combinar(self._somar(atual[atual["id_curso"].isin(ids)]), 1)
+
+    def horas(self, por: list[str], anos: list[int] | None = None) -> pd.DataFrame:
+        celulas: pd.DataFrame = self.celulas
+
+        if anos is not None:
+            celulas = celulas[celulas.index.get_level_values("ano").isin(anos)]
+
+        return celulas.groupby(level=por).sum().reset_index()